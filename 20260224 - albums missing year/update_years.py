@@ -16,19 +16,32 @@ falls back to MusicBrainz when Discogs returns no usable results.
 
 Run via `uv` so no separate requirements file is required:
     ./update_years.py /path/to/db
+
+Or in two phases: look everything up unattended, review/edit the plan (the
+`action` column is 'apply' or 'skip'), then write the tags in one go:
+    ./update_years.py /path/to/db --write-plan plan.csv
+    ./update_years.py /path/to/db --apply-plan plan.csv
 """
 
 import argparse
+import csv
 import os
 import re
 import sqlite3
 import sys
-from typing import Optional, List, Tuple
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, NamedTuple, Optional, List, Tuple
+from urllib.parse import urlsplit
 
 import requests
 import musicbrainzngs
 from mutagen.mp3 import MP3
-from mutagen.id3 import ID3, TDRC, ID3NoHeaderError
+from mutagen import PaddingInfo
+from mutagen.id3 import ID3, TDRC, TYER, ID3NoHeaderError
 import json
 from datetime import datetime
 try:
@@ -40,6 +53,183 @@ except ImportError:
 
 
 YEAR_RE = re.compile(r"^(\d{4})$")
+DISCOGS_SEARCH_URL = "https://api.discogs.com/database/search"
+MUSICBRAINZ_URL = "https://musicbrainz.org"
+# Discogs allows 60 requests/minute with a token and 25 without; MusicBrainz 1/second.
+DISCOGS_INTERVAL = 1.0
+DISCOGS_ANONYMOUS_INTERVAL = 2.4
+MUSICBRAINZ_INTERVAL = 1.0
+PREFETCH_DEPTH = 5
+WRITE_WORKERS = 8
+# compact the state journal once it holds this many superseded lines beyond one per album
+JOURNAL_SLACK = 1000
+CACHE_TTL_DAYS = 30
+CACHE_MAX_MB = 64
+PLAN_FIELDS = ['album_id', 'artist', 'album', 'current_date', 'year', 'score', 'action', 'source_url', 'api_artist', 'api_album']
+
+LookupResult = Tuple[str, str, str, str]
+
+
+class RateLimiter:
+    """Spaces out calls to one service. Safe to share between threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def normalize_query(text: Optional[str]) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+class ResponseCache:
+    """SQLite cache of parsed Discogs/MusicBrainz search responses.
+
+    Keyed by service and endpoint plus the normalized query parameters, so
+    responses from a stub server never answer real lookups. Reruns with
+    --force or another threshold make no network calls. Entries older than
+    `ttl` seconds are ignored and purged; once the stored bodies exceed
+    `max_bytes` the oldest entries are evicted. One connection is shared
+    by the lookup threads behind a lock.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS response (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS response_fetched_at ON response (fetched_at)")
+            self._conn.execute("DELETE FROM response WHERE fetched_at < ?", (time.time() - ttl,))
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+
+    @staticmethod
+    def _key(service: str, params: Dict[str, Any]) -> str:
+        return service + ":" + json.dumps(params, sort_keys=True, ensure_ascii=False)
+
+    def get(self, service: str, params: Dict[str, Any]) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM response WHERE key = ? AND fetched_at >= ?",
+                (self._key(service, params), time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, service: str, params: Dict[str, Any], data: Any) -> None:
+        key = self._key(service, params)
+        body = json.dumps(data, ensure_ascii=False)
+        size = len(body.encode("utf-8"))
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM response WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response (key, body, size, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, body, size, time.time()),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # keep the newest entries that fit in 90% of the budget, so eviction doesn't run on every put
+        self._conn.execute("""
+            DELETE FROM response WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY fetched_at DESC, key) AS kept FROM response
+                ) WHERE kept > ?
+            )
+        """, (int(self.max_bytes * 0.9),))
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StateJournal:
+    """Processed-album state kept as an append-only JSONL journal.
+
+    Each decision appends one line ({"id": album_id, ...}); on load later
+    lines win, and a torn last line from an interrupted run is ignored.
+    The file is rewritten with one line per album when superseded lines
+    pile up. A legacy JSON state file is migrated on first use and left in
+    place.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None):
+        self.path = path
+        self.state: Dict[str, dict] = {}
+        self._lines = 0
+        rewrite = True
+        if os.path.exists(path):
+            line = '\n'
+            with open(path, 'r', encoding='utf-8') as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                        album_id = entry.pop('id')
+                    except (ValueError, KeyError, AttributeError):
+                        continue
+                    self.state[album_id] = entry
+                    self._lines += 1
+            # a torn last line would swallow the next append
+            rewrite = not line.endswith('\n') or self._lines > len(self.state) + JOURNAL_SLACK
+        elif legacy_path and os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, 'r', encoding='utf-8') as fh:
+                    self.state = json.load(fh)
+            except (OSError, ValueError):
+                self.state = {}
+            else:
+                print(f'Migrated {len(self.state)} album(s) from {legacy_path} to {path}')
+        if rewrite:
+            self.compact()
+        self._fh = open(path, 'a', encoding='utf-8')
+
+    def __contains__(self, album_id: str) -> bool:
+        return album_id in self.state
+
+    def __getitem__(self, album_id: str) -> dict:
+        return self.state[album_id]
+
+    def record(self, album_id: str, entry: dict) -> None:
+        self.state[album_id] = entry
+        self._fh.write(json.dumps(dict(entry, id=album_id), ensure_ascii=False) + '\n')
+        self._fh.flush()
+        self._lines += 1
+        if self._lines > len(self.state) + JOURNAL_SLACK:
+            self._fh.close()
+            self.compact()
+            self._fh = open(self.path, 'a', encoding='utf-8')
+
+    def compact(self) -> None:
+        """Rewrite the journal with the latest line for each album."""
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            fh.write(''.join(json.dumps(dict(entry, id=album_id), ensure_ascii=False) + '\n' for album_id, entry in self.state.items()))
+        os.replace(tmp, self.path)
+        self._lines = len(self.state)
+
+    def close(self) -> None:
+        self._fh.close()
 
 
 def find_problem_albums(conn: sqlite3.Connection, with_plays_or_ratings: bool = False) -> List[sqlite3.Row]:
@@ -70,25 +260,41 @@ def find_problem_albums(conn: sqlite3.Connection, with_plays_or_ratings: bool =
     return cur.fetchall()
 
 
-def lookup_year_discogs(artist: str, album: str, token: Optional[str], user_agent: str) -> Optional[Tuple[str, str, str, str]]:
+def lookup_year_discogs(
+    artist: str,
+    album: str,
+    token: Optional[str],
+    user_agent: str,
+    url: str = DISCOGS_SEARCH_URL,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+) -> Optional[LookupResult]:
     """Return (year, url, artist_name, album_name) from Discogs or None."""
     if not artist and not album:
         return None
-    url = "https://api.discogs.com/database/search"
     params = {
         "artist": artist or "",
         "release_title": album or "",
         "per_page": 5,
     }
-    if token:
-        params["token"] = token
-    headers = {"User-Agent": user_agent}
-    try:
-        r = requests.get(url, params=params, headers=headers, timeout=10)
-        r.raise_for_status()
-    except Exception:
-        return None
-    data = r.json()
+    cache_params = dict(params, artist=normalize_query(artist), release_title=normalize_query(album))
+    service = f"discogs {url}"
+    data = cache.get(service, cache_params) if cache else None
+    if data is None:
+        if token:
+            params["token"] = token
+        headers = {"User-Agent": user_agent}
+        if limiter:
+            limiter.wait()
+        try:
+            r = (session or requests).get(url, params=params, headers=headers, timeout=10)
+            r.raise_for_status()
+        except Exception:
+            return None
+        data = r.json()
+        if cache:
+            cache.put(service, cache_params, data)
     results = data.get("results", [])
     years = []
     result_url = None
@@ -107,7 +313,31 @@ def lookup_year_discogs(artist: str, album: str, token: Optional[str], user_agen
     return None
 
 
-def lookup_year_mb(artist: str, album: str) -> Optional[Tuple[str, str, str, str]]:
+def _search_mb(
+    search: Callable[..., Dict[str, Any]],
+    service: str,
+    params: Dict[str, Any],
+    limiter: Optional[RateLimiter],
+    cache: Optional[ResponseCache],
+) -> Dict[str, Any]:
+    cache_params = {k: normalize_query(v) if isinstance(v, str) else v for k, v in params.items()}
+    data = cache.get(service, cache_params) if cache else None
+    if data is None:
+        if limiter:
+            limiter.wait()
+        data = search(**params)
+        if cache:
+            cache.put(service, cache_params, data)
+    return data
+
+
+def lookup_year_mb(
+    artist: str,
+    album: str,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    server: str = MUSICBRAINZ_URL,
+) -> Optional[LookupResult]:
     """Return (year, url, artist_name, album_name) from MusicBrainz or None.
     Prioritizes actual release dates (release-events) over release group first-release-date.
     """
@@ -117,7 +347,10 @@ def lookup_year_mb(artist: str, album: str) -> Optional[Tuple[str, str, str, str
 
     # Search releases first (more authoritative dates via release-events)
     try:
-        r = musicbrainzngs.search_releases(artist=artist or "", release=album or "", limit=10)
+        r = _search_mb(
+            musicbrainzngs.search_releases, f"musicbrainz-release {server}",
+            {"artist": artist or "", "release": album or "", "limit": 10}, limiter, cache,
+        )
         rels = r.get("release-list", [])
         for rel in rels:
             # prefer release-events which have actual structured dates
@@ -150,7 +383,10 @@ def lookup_year_mb(artist: str, album: str) -> Optional[Tuple[str, str, str, str
 
     # Fallback to release groups if release search didn't yield results
     try:
-        res = musicbrainzngs.search_release_groups(artist=artist or "", releasegroup=album or "", limit=5)
+        res = _search_mb(
+            musicbrainzngs.search_release_groups, f"musicbrainz-release-group {server}",
+            {"artist": artist or "", "releasegroup": album or "", "limit": 5}, limiter, cache,
+        )
         rgs = res.get("release-group-list", [])
         for rg in rgs:
             d = rg.get("first-release-date")
@@ -169,12 +405,110 @@ def lookup_year_mb(artist: str, album: str) -> Optional[Tuple[str, str, str, str
     return None
 
 
-def check_similarity(db_artist: str, db_album: str, api_artist: str, api_album: str, threshold: float = 0.7) -> bool:
-    """Check if API results match DB values using Levenshtein distance. Returns True if similar enough."""
+def lookup_year(
+    artist: str,
+    album: str,
+    discogs_token: Optional[str],
+    user_agent: str,
+    discogs_url: str = DISCOGS_SEARCH_URL,
+    session: Optional[requests.Session] = None,
+    discogs_limiter: Optional[RateLimiter] = None,
+    mb_limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    mb_url: str = MUSICBRAINZ_URL,
+) -> Optional[LookupResult]:
+    """Try Discogs first, then MusicBrainz (`mb_url` only keys the cache; musicbrainzngs holds the host)."""
+    try:
+        result = lookup_year_discogs(artist, album, discogs_token, user_agent, discogs_url, session, discogs_limiter, cache)
+    except Exception:
+        result = None
+    if result:
+        return result
+    return lookup_year_mb(artist, album, mb_limiter, cache, mb_url)
+
+
+class YearPrefetcher:
+    """Looks up years for the albums ahead of the one being prompted.
+
+    Up to `depth` lookups run in the background, so by the time one prompt
+    is answered the next album is usually resolved. The rate limiters
+    passed to `lookup` keep the workers within each service's quota.
+    A depth of 0 looks each album up only when it is reached.
+    """
+
+    def __init__(self, lookup: Callable[[str, str], Optional[LookupResult]], depth: int = PREFETCH_DEPTH):
+        self.lookup = lookup
+        self.depth = depth
+        self._executor = ThreadPoolExecutor(max_workers=depth, thread_name_prefix='lookup') if depth > 0 else None
+
+    def _submit(self, alb: sqlite3.Row) -> 'Future[Optional[LookupResult]]':
+        return self._executor.submit(self.lookup, alb['album_artist'], alb['name'])
+
+    def results(self, albums: Iterable[sqlite3.Row]) -> Iterator[Tuple[sqlite3.Row, Optional[LookupResult]]]:
+        """Yield (album, lookup result) in the order given."""
+        if self._executor is None:
+            for alb in albums:
+                yield alb, self.lookup(alb['album_artist'], alb['name'])
+            return
+        remaining = iter(albums)
+        window: Deque[Tuple[sqlite3.Row, Future]] = deque((alb, self._submit(alb)) for alb in islice(remaining, self.depth))
+        while window:
+            alb, future = window.popleft()
+            upcoming = next(remaining, None)
+            if upcoming is not None:
+                window.append((upcoming, self._submit(upcoming)))
+            yield alb, future.result()
+
+    def close(self) -> None:
+        """Drop lookups that have not started; the ones in flight finish in the background."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def similarity_score(db_artist: str, db_album: str, api_artist: str, api_album: str) -> float:
+    """Average Levenshtein similarity (0-1) of the artist and album names."""
     artist_sim = ratio(db_artist, api_artist) if db_artist and api_artist else 0.0
     album_sim = ratio(db_album, api_album) if db_album and api_album else 0.0
-    avg_sim = (artist_sim + album_sim) / 2.0
-    return avg_sim >= threshold
+    return (artist_sim + album_sim) / 2.0
+
+
+def check_similarity(db_artist: str, db_album: str, api_artist: str, api_album: str, threshold: float = 0.7) -> bool:
+    """Check if API results match DB values using Levenshtein distance. Returns True if similar enough."""
+    return similarity_score(db_artist, db_album, api_artist, api_album) >= threshold
+
+
+def plan_row(alb: sqlite3.Row, result: Optional[LookupResult], threshold: float) -> dict:
+    """One plan entry; `action` is 'apply' for a confident match and 'skip' otherwise."""
+    row = {field: '' for field in PLAN_FIELDS}
+    row.update(album_id=alb['id'], artist=alb['album_artist'] or '', album=alb['name'] or '', current_date=alb['date'] or '', action='skip')
+    if result:
+        year, source_url, api_artist, api_album = result
+        score = similarity_score(alb['album_artist'], alb['name'], api_artist, api_album)
+        row.update(
+            year=year, score=round(score, 3), source_url=source_url or '', api_artist=api_artist, api_album=api_album,
+            action='apply' if score >= threshold else 'skip',
+        )
+    return row
+
+
+def write_plan(path: str, rows: List[dict]) -> None:
+    """Write the plan as CSV if the path ends in .csv, JSON otherwise."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as fh:
+        if path.lower().endswith('.csv'):
+            writer = csv.DictWriter(fh, fieldnames=PLAN_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            fh.write(json.dumps(rows, indent=2, ensure_ascii=False))
+    os.replace(tmp, path)
+
+
+def read_plan(path: str) -> List[dict]:
+    with open(path, 'r', encoding='utf-8', newline='') as fh:
+        if path.lower().endswith('.csv'):
+            return list(csv.DictReader(fh))
+        return json.load(fh)
 
 
 def find_mp3_files(conn: sqlite3.Connection, album_id: str, media_root: Optional[str]) -> List[str]:
@@ -193,69 +527,78 @@ def find_mp3_files(conn: sqlite3.Connection, album_id: str, media_root: Optional
     return files
 
 
-def set_id3_year(path: str, year: str) -> bool:
-    if not os.path.exists(path):
-        return False
-    # quick check for ID3v1 tag (last 128 bytes start with 'TAG')
-    has_v1 = False
-    try:
-        with open(path, 'rb') as fh:
-            fh.seek(-128, os.SEEK_END)
-            tag = fh.read(128)
-            if len(tag) == 128 and tag[:3] == b'TAG':
-                has_v1 = True
-    except Exception:
-        pass
+class TagWrite(NamedTuple):
+    path: str
+    ok: bool
+    # 'in_place' (fitted in the existing padding), 'rewritten' (whole file moved),
+    # 'created' (new ID3v2 tag), 'skipped_v1', 'missing' or 'failed'
+    status: str
+
+
+def set_id3_year(path: str, year: str) -> TagWrite:
+    """Set the year of one MP3, opening it only once.
+
+    The ID3v1 check reuses the tag mutagen has already parsed, and the
+    padding callback records whether the new tag fitted in place.
+    """
+    rewritten = False
+
+    def padding(info: PaddingInfo) -> int:
+        nonlocal rewritten
+        chosen = info.get_default_padding()
+        rewritten = chosen != info.padding
+        return chosen
 
-    # Try to use ID3v2 if present
     try:
-        id3 = ID3(path)
-        ver = getattr(id3, 'version', None)
-        # prefer v2.4 -> TDRC, v2.3 -> TYER
-        if ver and len(ver) >= 2 and ver[1] == 4:
-            id3.delall('TDRC')
-            id3.add(TDRC(encoding=3, text=year))
-        else:
-            # default to v2.3 TYER for v2.3 and other unknown v2 versions
-            from mutagen.id3 import TYER
-            id3.delall('TYER')
-            id3.add(TYER(encoding=3, text=year))
-        id3.save(path)
-        return True
-    except ID3NoHeaderError:
-        # No ID3v2 header found
-        if has_v1:
-            # update ID3v1 year field at offset 93..96 of the 128-byte tag
-            # try:
-            #     with open(path, 'r+b') as fh:
-            #         fh.seek(-128, os.SEEK_END)
-            #         tag = bytearray(fh.read(128))
-            #         if tag[:3] == b'TAG':
-            #             yb = year.encode('ascii')[:4]
-            #             # pad/truncate to 4 bytes
-            #             yb = yb.ljust(4, b' ')
-            #             tag[93:97] = yb
-            #             fh.seek(-128, os.SEEK_END)
-            #             fh.write(tag)
-            #             return True
-            # except Exception:
-            #     return False
-
-            # this is too dodgy for my liking, just skip instead
-            print(f"ID3v1 found, skipping {path}")
-            return False
-        # no existing tags at all: create ID3v2.3 tag by default
-        try:
-            id3 = ID3()
-            from mutagen.id3 import TYER
-            id3.add(TYER(encoding=3, text=year))
-            # save defaulting to v2.3 for compatibility
-            id3.save(path, v2_version=(2, 3, 0))
-            return True
-        except Exception:
-            return False
+        with open(path, 'r+b') as fh:
+            try:
+                id3 = ID3(fh)
+            except ID3NoHeaderError:
+                # no existing tags at all: create ID3v2.3 tag by default
+                id3 = ID3()
+                id3.add(TYER(encoding=3, text=year))
+                fh.seek(0)
+                # save defaulting to v2.3 for compatibility
+                id3.save(fh, v2_version=3)
+                return TagWrite(path, True, 'created')
+            ver = id3.version
+            if ver < (2, 2, 0):
+                # only an ID3v1 tag; writing its year field in place is too dodgy for my liking, just skip instead
+                return TagWrite(path, False, 'skipped_v1')
+            # prefer v2.4 -> TDRC, v2.3 -> TYER
+            if ver[1] == 4:
+                id3.delall('TDRC')
+                id3.add(TDRC(encoding=3, text=year))
+            else:
+                # default to v2.3 TYER for v2.3 and other unknown v2 versions
+                id3.delall('TYER')
+                id3.add(TYER(encoding=3, text=year))
+            fh.seek(0)
+            id3.save(fh, padding=padding)
+    except FileNotFoundError:
+        return TagWrite(path, False, 'missing')
     except Exception:
-        return False
+        return TagWrite(path, False, 'failed')
+    return TagWrite(path, True, 'rewritten' if rewritten else 'in_place')
+
+
+def set_id3_years(jobs: Iterable[Tuple[str, str]], workers: int = WRITE_WORKERS) -> Iterator[TagWrite]:
+    """Run set_id3_year for (path, year) pairs on a thread pool, yielding results in order."""
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='id3') as pool:
+        yield from pool.map(lambda job: set_id3_year(*job), jobs)
+
+
+def report_tag_write(write: TagWrite) -> None:
+    if write.status == 'skipped_v1':
+        print(f"ID3v1 found, skipping {write.path}")
+    elif write.status == 'rewritten':
+        print('Updated', write.path, '(rewritten)')
+    elif write.status == 'created':
+        print('Updated', write.path, '(new ID3v2 tag, rewritten)')
+    elif write.ok:
+        print('Updated', write.path)
+    else:
+        print('Failed to update', write.path, f'({write.status})')
 
 
 def prompt_yes_no_all(prompt: str) -> str:
@@ -274,136 +617,222 @@ def main(argv=None):
     parser.add_argument('--user-agent', help='User-Agent for web APIs', default='albums-missing-year-script/0.1 (example@example.com)')
     parser.add_argument('--discogs-token', help='Discogs personal access token (optional)', default=None)
     parser.add_argument('--media-root', help='Prefix to join with media_file.path when path is relative', default=None)
-    parser.add_argument('--state-file', help='JSON file to track processed albums', default='update_years_state.json')
+    parser.add_argument('--state-file', help='JSONL journal tracking processed albums (an older .json state file next to it is migrated)', default='update_years_state.jsonl')
     parser.add_argument('--force', help='Reprocess albums even if present in state file', action='store_true')
     parser.add_argument('--similarity-threshold', help='Minimum Levenshtein similarity (0-1) for artist/album match', type=float, default=0.7)
     parser.add_argument('--with-plays-or-ratings', help='Only process albums with tracks that have plays or ratings', action='store_true')
     parser.add_argument('--dry-run', help="Don't write tags; just print what would be done", action='store_true')
+    parser.add_argument('--prefetch', help='Number of upcoming albums to look up in the background (0 to disable)', type=int, default=PREFETCH_DEPTH)
+    parser.add_argument('--discogs-url', help='Discogs database search endpoint', default=DISCOGS_SEARCH_URL)
+    parser.add_argument('--discogs-interval', help='Minimum seconds between Discogs requests (default: 1.0 with a token, 2.4 without)', type=float, default=None)
+    parser.add_argument('--musicbrainz-url', help='MusicBrainz server', default=MUSICBRAINZ_URL)
+    parser.add_argument('--musicbrainz-interval', help='Minimum seconds between MusicBrainz requests', type=float, default=MUSICBRAINZ_INTERVAL)
+    parser.add_argument('--cache-file', help='SQLite file caching Discogs/MusicBrainz responses', default='update_years_cache.sqlite')
+    parser.add_argument('--no-cache', help="Don't read or write the response cache", action='store_true')
+    parser.add_argument('--cache-ttl-days', help='Ignore cached responses older than this', type=float, default=CACHE_TTL_DAYS)
+    parser.add_argument('--cache-max-mb', help='Evict the oldest cached responses beyond this size', type=float, default=CACHE_MAX_MB)
+    parser.add_argument('--write-workers', help='Threads writing ID3 tags in parallel', type=int, default=WRITE_WORKERS)
+    batch = parser.add_mutually_exclusive_group()
+    batch.add_argument('--write-plan', metavar='PLAN', help='Look up every album without prompting and write a reviewable plan (.json or .csv)', default=None)
+    batch.add_argument('--apply-plan', metavar='PLAN', help='Write the years of the rows marked "apply" in an (edited) plan, without lookups', default=None)
     args = parser.parse_args(argv)
+    if args.prefetch < 0:
+        parser.error('--prefetch must not be negative')
 
     if not os.path.exists(args.db):
         print('Database not found:', args.db)
         sys.exit(1)
 
     musicbrainzngs.set_useragent('albums-missing-year-script', '0.1', args.user_agent)
+    mb_server = urlsplit(args.musicbrainz_url)
+    musicbrainzngs.set_hostname(mb_server.netloc, use_https=mb_server.scheme == 'https')
+    # musicbrainzngs' own limiter holds a lock for the whole request; ours only spaces the starts
+    musicbrainzngs.set_rate_limit(False)
+    discogs_interval = args.discogs_interval
+    if discogs_interval is None:
+        discogs_interval = DISCOGS_INTERVAL if args.discogs_token else DISCOGS_ANONYMOUS_INTERVAL
+    discogs_limiter = RateLimiter(discogs_interval)
+    mb_limiter = RateLimiter(args.musicbrainz_interval)
+    session = requests.Session()
+    cache = None
+    if not args.no_cache and not args.apply_plan:
+        cache = ResponseCache(args.cache_file, args.cache_ttl_days * 86400, int(args.cache_max_mb * 1024 * 1024))
+
+    def lookup(artist: str, album: str) -> Optional[LookupResult]:
+        return lookup_year(
+            artist, album, args.discogs_token, args.user_agent, args.discogs_url, session,
+            discogs_limiter, mb_limiter, cache, args.musicbrainz_url,
+        )
 
     conn = sqlite3.connect(args.db)
 
-    # load state of processed albums
-    def load_state(path: str):
-        try:
-            with open(path, 'r', encoding='utf-8') as fh:
-                return json.load(fh)
-        except Exception:
-            return {}
-
-    def save_state(path: str, data: dict):
-        tmp = path + '.tmp'
-        try:
-            with open(tmp, 'w', encoding='utf-8') as fh:
-                json.dump(data, fh, indent=2, ensure_ascii=False)
-            os.replace(tmp, path)
-        except Exception:
-            try:
-                if os.path.exists(tmp):
-                    os.remove(tmp)
-            except Exception:
-                pass
-
-    def mark_processed(state: dict, album_id: str, name: str, artist: str, year: str, decision: str, dry_run: bool):
-        state[album_id] = {
+    def mark_processed(state: StateJournal, album_id: str, name: str, artist: str, year: str, decision: str, dry_run: bool):
+        state.record(album_id, {
             'name': name,
             'artist': artist,
             'year': year,
             'decision': decision,
             'dry_run': bool(dry_run),
             'timestamp': datetime.utcnow().isoformat() + 'Z'
-        }
-        save_state(args.state_file, state)
+        })
 
-    state = load_state(args.state_file)
+    # load state of processed albums; an explicit .json path is the old format, journal next to it
+    state_path = args.state_file
+    if state_path.lower().endswith('.json'):
+        state_path += 'l'
+    state = StateJournal(state_path, os.path.splitext(state_path)[0] + '.json')
+
+    if args.apply_plan:
+        try:
+            rows = read_plan(args.apply_plan)
+        except (OSError, ValueError, csv.Error) as e:
+            print('Could not read plan:', e)
+            sys.exit(1)
+        jobs = []
+        for row in rows:
+            album_id = str(row.get('album_id') or '')
+            name = row.get('album') or ''
+            artist = row.get('artist') or ''
+            year = str(row.get('year') or '').strip()
+            action = str(row.get('action') or '').strip().lower()
+            if not album_id or not year:
+                continue
+            if not args.force and album_id in state:
+                print(f"Skipping already-processed album: {name} ({album_id}) -> {state[album_id].get('decision')}")
+                continue
+            if action != 'apply':
+                try:
+                    mismatch = float(row.get('score') or 0) < args.similarity_threshold
+                except ValueError:
+                    mismatch = False
+                mark_processed(state, album_id, name, artist, year, 'skipped_mismatch' if mismatch else 'rejected', args.dry_run)
+                continue
+            if not YEAR_RE.match(year):
+                print(f'Skipping {artist} - {name}: year {year!r} is not YYYY')
+                continue
+            mp3s = find_mp3_files(conn, album_id, args.media_root)
+            mark_processed(state, album_id, name, artist, year, 'accepted', args.dry_run)
+            for p in mp3s:
+                if args.dry_run:
+                    print('Would update:', p)
+                    continue
+                jobs.append((p, year))
+        # all albums' files go through one pool, so box sets don't write one file at a time
+        updated = rewritten = 0
+        for write in set_id3_years(jobs, args.write_workers):
+            updated += write.ok
+            # a new ID3v2 tag is prepended, so the whole file is rewritten too
+            full_rewrite = write.status in ('rewritten', 'created')
+            rewritten += full_rewrite
+            if not write.ok or full_rewrite:
+                report_tag_write(write)
+        print(f'Updated {updated} file(s) ({rewritten} rewritten in full), {len(jobs) - updated} failed or skipped.')
+        state.close()
+        conn.close()
+        return
 
     albums = find_problem_albums(conn, args.with_plays_or_ratings)
     if not albums:
         print('No albums with missing/non-YYYY dates found.')
+        state.close()
+        conn.close()
         return
 
     apply_all = None  # None means ask; True means apply all; False means skip all
 
+    # skip if processed already unless --force
+    todo = []
     for alb in albums:
-        album_id = alb['id']
-        name = alb['name']
-        artist = alb['album_artist']
-        cur_date = alb['date']
-        # skip if processed already unless --force
-        if not args.force and album_id in state:
-            print(f"Skipping already-processed album: {name} ({album_id}) -> {state[album_id].get('decision')}")
+        if not args.force and alb['id'] in state:
+            print(f"Skipping already-processed album: {alb['name']} ({alb['id']}) -> {state[alb['id']].get('decision')}")
             continue
-        print('\nAlbum:', name)
-        print('Artist:', artist)
-        print('Current date field:', repr(cur_date))
-        year = None
-        source_url = None
-        api_artist = None
-        api_album = None
-        # Try Discogs first
+        todo.append(alb)
+
+    if args.write_plan:
+        rows = []
+        prefetcher = YearPrefetcher(lookup, max(args.prefetch, 1))
         try:
-            result = lookup_year_discogs(artist, name, args.discogs_token, args.user_agent)
-            if result:
-                year, source_url, api_artist, api_album = result
-        except Exception:
-            year = None
-        if not year:
-            result = lookup_year_mb(artist, name)
-            if result:
-                year, source_url, api_artist, api_album = result
-        if not year:
-            print('Could not find a reliable year via Discogs/MusicBrainz.')
-            continue
-        # Check similarity between DB values and API results
-        if not check_similarity(artist, name, api_artist, api_album, args.similarity_threshold):
-            print(f'Skipping: Low similarity match (API: {api_artist} - {api_album})')
-            mark_processed(state, album_id, name, artist, year, 'skipped_mismatch', args.dry_run)
-            continue
-        print('Discovered year:', year)
-        if source_url:
-            print('Source URL:', source_url)
-        mp3s = find_mp3_files(conn, album_id, args.media_root)
-        print('MP3 files found for album:', len(mp3s))
-
-        if apply_all is True:
-            do_apply = True
-        elif apply_all is False:
-            do_apply = False
-        else:
-            resp = prompt_yes_no_all(f"Update ID3 year to {year} for this album?")
-            if resp == 'y':
-                do_apply = True
-            elif resp == 'n':
-                do_apply = False
-            elif resp == 'a':
-                do_apply = True
-                apply_all = True
-            elif resp == 's':
-                do_apply = False
-                apply_all = False
-            elif resp == 'q':
-                print('Quitting.')
-                break
+            for i, (alb, result) in enumerate(prefetcher.results(todo), 1):
+                row = plan_row(alb, result, args.similarity_threshold)
+                rows.append(row)
+                found = f"{row['year']} (score {row['score']}, {row['action']})" if row['year'] else 'no year found'
+                print(f"[{i}/{len(todo)}] {row['artist']} - {row['album']}: {found}", file=sys.stderr)
+        finally:
+            prefetcher.close()
+            session.close()
+            if cache:
+                cache.close()
+            # a partial plan is still worth reviewing
+            write_plan(args.write_plan, rows)
+        to_apply = sum(row['action'] == 'apply' for row in rows)
+        print(f'Wrote {len(rows)} album(s) to {args.write_plan}: {to_apply} to apply, {len(rows) - to_apply} to skip.')
+        state.close()
+        conn.close()
+        return
 
-        if do_apply:
-            # record decision as 'accepted'
-            mark_processed(state, album_id, name, artist, year, 'accepted', args.dry_run)
-            if args.dry_run:
-                for p in mp3s:
-                    print('Would update:', p)
+    prefetcher = YearPrefetcher(lookup, args.prefetch)
+    try:
+        for alb, result in prefetcher.results(todo):
+            album_id = alb['id']
+            name = alb['name']
+            artist = alb['album_artist']
+            cur_date = alb['date']
+            print('\nAlbum:', name)
+            print('Artist:', artist)
+            print('Current date field:', repr(cur_date))
+            if not result:
+                print('Could not find a reliable year via Discogs/MusicBrainz.')
                 continue
-            for p in mp3s:
-                ok = set_id3_year(p, year)
-                print(('Updated' if ok else 'Failed to update'), p)
-        else:
-            # record decision as 'rejected'
-            mark_processed(state, album_id, name, artist, year, 'rejected', args.dry_run)
+            year, source_url, api_artist, api_album = result
+            # Check similarity between DB values and API results
+            if not check_similarity(artist, name, api_artist, api_album, args.similarity_threshold):
+                print(f'Skipping: Low similarity match (API: {api_artist} - {api_album})')
+                mark_processed(state, album_id, name, artist, year, 'skipped_mismatch', args.dry_run)
+                continue
+            print('Discovered year:', year)
+            if source_url:
+                print('Source URL:', source_url)
+            mp3s = find_mp3_files(conn, album_id, args.media_root)
+            print('MP3 files found for album:', len(mp3s))
+
+            if apply_all is True:
+                do_apply = True
+            elif apply_all is False:
+                do_apply = False
+            else:
+                resp = prompt_yes_no_all(f"Update ID3 year to {year} for this album?")
+                if resp == 'y':
+                    do_apply = True
+                elif resp == 'n':
+                    do_apply = False
+                elif resp == 'a':
+                    do_apply = True
+                    apply_all = True
+                elif resp == 's':
+                    do_apply = False
+                    apply_all = False
+                elif resp == 'q':
+                    print('Quitting.')
+                    break
+
+            if do_apply:
+                # record decision as 'accepted'
+                mark_processed(state, album_id, name, artist, year, 'accepted', args.dry_run)
+                if args.dry_run:
+                    for p in mp3s:
+                        print('Would update:', p)
+                    continue
+                for write in set_id3_years(((p, year) for p in mp3s), args.write_workers):
+                    report_tag_write(write)
+            else:
+                # record decision as 'rejected'
+                mark_processed(state, album_id, name, artist, year, 'rejected', args.dry_run)
+    finally:
+        prefetcher.close()
+        session.close()
+        if cache:
+            cache.close()
+        state.close()
 
     conn.close()
 
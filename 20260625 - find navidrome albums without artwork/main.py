@@ -1,24 +1,53 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.13"
-# dependencies = ["requests"]
+# dependencies = ["requests", "mutagen"]
 # ///
 """GUI to find Navidrome albums lacking cover art and download artwork for them."""
 
 import argparse
+import base64
+import csv
+import hashlib
+import json
 import os
+import queue
+import re
+import secrets
 import sqlite3
+import sys
+import threading
 import time
 import tkinter as tk
 import uuid
 import webbrowser
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
 from math import ceil
 from tkinter import messagebox, ttk
 from urllib.parse import quote_plus
 
 import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "Mozilla/5.0 (album-art-downloader)"
+DOWNLOAD_WORKERS = 8
+POLL_INTERVAL_MS = 100
+RESCAN_SETTLE_SECONDS = 3.0
+RESCAN_WORKERS = 8
+SUBSONIC_API_VERSION = "1.16.1"
+SUBSONIC_CLIENT = "album-art-finder"
+ART_CACHE_VERSION = 3
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+AUDIO_EXTENSIONS = {".mp3", ".flac", ".m4a", ".mp4", ".aac", ".ogg", ".oga", ".opus", ".aiff", ".aif", ".wav", ".wma", ".ape", ".wv"}
+COVER_NAME_HINTS = {"cover", "front", "folder"}
+# Scans of the rest of the packaging, never used as the cover.
+NON_COVER_NAME_HINTS = {"back", "cd", "disc", "inlay", "booklet"}
+MIME_EXTENSIONS = {"image/jpeg": ".jpg", "image/jpg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+# ID3/FLAC picture type for the front cover.
+FRONT_COVER = 3
 
 
 @dataclass
@@ -34,38 +63,41 @@ class AlbumInfo:
     total_plays: int
 
 
-def query_albums_without_art(db_path: str) -> list[AlbumInfo]:
-    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT
-            f.id AS folder_id,
-            f.path AS folder_path,
-            f.name AS folder_name,
-            COALESCE(
-                NULLIF(MAX(mf.album_artist), ''),
-                NULLIF(MAX(mf.artist), ''),
-                'Unknown Artist'
-            ) AS artist,
-            COALESCE(NULLIF(MAX(mf.album), ''), f.name) AS album,
-            COUNT(CASE WHEN a.rating > 0 THEN 1 END) AS rated_songs,
-            COUNT(CASE WHEN a.play_count > 0 THEN 1 END) AS played_songs,
-            COALESCE(SUM(CASE WHEN a.rating > 0 THEN a.rating ELSE 0 END), 0) AS total_rating,
-            COALESCE(SUM(CASE WHEN a.play_count > 0 THEN a.play_count ELSE 0 END), 0) AS total_plays
-        FROM folder f
-        JOIN media_file mf ON mf.folder_id = f.id
-        LEFT JOIN annotation a ON a.item_id = mf.id AND a.item_type = 'media_file'
-        WHERE f.image_files = '[]'
-          AND f.path != '.'
-          AND f.path != ''
-          AND f.num_audio_files > 0
-        GROUP BY f.id
-        ORDER BY rated_songs DESC, played_songs DESC, total_rating DESC, total_plays DESC
-    """)
-
-    albums = [
+ALBUMS_WITHOUT_ART_SQL = """
+    SELECT
+        f.id AS folder_id,
+        f.path AS folder_path,
+        f.name AS folder_name,
+        COALESCE(
+            NULLIF(MAX(mf.album_artist), ''),
+            NULLIF(MAX(mf.artist), ''),
+            'Unknown Artist'
+        ) AS artist,
+        COALESCE(NULLIF(MAX(mf.album), ''), f.name) AS album,
+        COUNT(CASE WHEN a.rating > 0 THEN 1 END) AS rated_songs,
+        COUNT(CASE WHEN a.play_count > 0 THEN 1 END) AS played_songs,
+        COALESCE(SUM(CASE WHEN a.rating > 0 THEN a.rating ELSE 0 END), 0) AS total_rating,
+        COALESCE(SUM(CASE WHEN a.play_count > 0 THEN a.play_count ELSE 0 END), 0) AS total_plays
+    FROM folder f
+    JOIN media_file mf ON mf.folder_id = f.id
+    LEFT JOIN annotation a ON a.item_id = mf.id AND a.item_type = 'media_file'
+    WHERE f.image_files = '[]'
+      AND f.path != '.'
+      AND f.path != ''
+      AND f.num_audio_files > 0
+      {folder_filter}
+    GROUP BY f.id
+    ORDER BY rated_songs DESC, played_songs DESC, total_rating DESC, total_plays DESC
+"""
+
+
+def _rank_key(album: AlbumInfo) -> tuple[int, int, int, int]:
+    return (-album.rated_songs, -album.played_songs, -album.total_rating, -album.total_plays)
+
+
+def _fetch_albums(conn: sqlite3.Connection, folder_filter: str = "") -> list[AlbumInfo]:
+    cursor = conn.execute(ALBUMS_WITHOUT_ART_SQL.format(folder_filter=folder_filter))
+    return [
         AlbumInfo(
             folder_id=row["folder_id"],
             folder_path=row["folder_path"],
@@ -80,46 +112,433 @@ def query_albums_without_art(db_path: str) -> list[AlbumInfo]:
         for row in cursor.fetchall()
     ]
 
-    conn.close()
+
+def load_art_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != ART_CACHE_VERSION:
+        return {}
+    return cache
+
+
+def save_art_cache(cache_path: str, cache: dict) -> None:
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        # dumps uses the C encoder; dump() streams through the pure-Python one.
+        f.write(json.dumps(cache))
+    os.replace(tmp_path, cache_path)
+
+
+def query_albums_without_art(db_path: str, cache_path: str | None = None) -> list[AlbumInfo]:
+    """Albums whose folder has no images, most rated and played first.
+
+    With ``cache_path``, per-folder results are kept in that JSON file and a
+    folder is only requeried when its ``updated_at``, ``image_files`` or the
+    checksum of its track annotations changed.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        if cache_path is None:
+            return _fetch_albums(conn)
+        return _query_albums_cached(conn, cache_path)
+    finally:
+        conn.close()
+
+
+def _query_albums_cached(conn: sqlite3.Connection, cache_path: str) -> list[AlbumInfo]:
+    cache = load_art_cache(cache_path)
+    cached_folders: dict[str, dict] = cache.get("folders", {})
+
+    # A checksum rather than timestamps: transfers and rating edits can change
+    # plays and ratings without moving play_date or rated_at. The rowid-weighted
+    # sums catch plays moved from one track to another, which keep the totals.
+    # CROSS JOIN keeps SQLite walking folders first rather than all of annotation.
+    checksums = {
+        row[0]: list(row[1:])
+        for row in conn.execute("""
+            SELECT
+                mf.folder_id,
+                COUNT(*),
+                MAX(a.rowid),
+                SUM(a.play_count),
+                SUM(a.rating),
+                SUM(a.rowid * a.play_count),
+                SUM(a.rowid * a.rating)
+            FROM folder f
+            CROSS JOIN media_file mf ON mf.folder_id = f.id
+            JOIN annotation a ON a.item_id = mf.id AND a.item_type = 'media_file'
+            WHERE f.image_files = '[]'
+              AND f.path != '.'
+              AND f.path != ''
+              AND f.num_audio_files > 0
+            GROUP BY mf.folder_id
+        """)
+    }
+
+    folders: dict[str, dict] = {}
+    dirty: set[str] = set()
+    for row in conn.execute("SELECT id, updated_at, image_files FROM folder"):
+        entry = cached_folders.get(row["id"])
+        key = [row["updated_at"], row["image_files"], checksums.get(row["id"])]
+        if entry is None or entry["key"] != key:
+            entry = {"key": key, "album": None}
+            dirty.add(row["id"])
+        folders[row["id"]] = entry
+
+    if dirty:
+        folder_filter = ""
+        if len(dirty) < len(folders):
+            conn.execute("CREATE TEMP TABLE dirty_folder (id TEXT PRIMARY KEY)")
+            conn.executemany("INSERT INTO temp.dirty_folder (id) VALUES (?)", [(folder_id,) for folder_id in dirty])
+            folder_filter = "AND f.id IN (SELECT id FROM temp.dirty_folder)"
+        found = {album.folder_id: album for album in _fetch_albums(conn, folder_filter)}
+        for folder_id in dirty:
+            album = found.get(folder_id)
+            folders[folder_id]["album"] = vars(album) if album else None
+
+    if dirty or folders.keys() != cached_folders.keys():
+        try:
+            save_art_cache(
+                cache_path,
+                {"version": ART_CACHE_VERSION, "folders": folders},
+            )
+        except OSError as e:
+            print(f"Warning: could not write cache {cache_path}: {e}", file=sys.stderr)
+    albums = [AlbumInfo(**entry["album"]) for entry in folders.values() if entry["album"] is not None]
+    albums.sort(key=_rank_key)
     return albums
 
 
+def write_album_list(albums: list[AlbumInfo], fmt: str, out) -> None:
+    rows = [asdict(album) for album in albums]
+    if fmt == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+        return
+    writer = csv.DictWriter(out, fieldnames=list(AlbumInfo.__dataclass_fields__))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
 def make_search_url(artist: str, album: str) -> str:
     query = quote_plus(f"{artist} - {album}")
     return f"https://www.google.com/search?tbm=isch&q={query}"
 
 
-def download_image(url: str, dest_path: str) -> None:
-    response = requests.get(
+def make_session(pool_size: int = DOWNLOAD_WORKERS) -> requests.Session:
+    """Session whose connection pool lets every download worker keep its connection alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def download_image(url: str, dest_path: str, session: requests.Session | None = None) -> None:
+    http = session if session is not None else requests
+    with http.get(
         url,
-        headers={"User-Agent": "Mozilla/5.0 (album-art-downloader)"},
+        headers={"User-Agent": USER_AGENT},
         timeout=30,
         stream=True,
+    ) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get("content-type", "")
+        if not content_type.startswith("image/"):
+            raise ValueError(f"URL did not return an image (content-type: {content_type})")
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        # Write aside and rename so a failed download never leaves a truncated cover.
+        part_path = f"{dest_path}.part"
+        try:
+            with open(part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+            os.replace(part_path, dest_path)
+        except BaseException:
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+            raise
+
+
+def _write_marker(path: str) -> bool:
+    try:
+        with open(path, "w") as f:
+            f.write("rescan trigger")
+    except OSError:
+        return False
+    return True
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def trigger_rescans(
+    album_dirs: Iterable[str],
+    settle_seconds: float = RESCAN_SETTLE_SECONDS,
+    workers: int = RESCAN_WORKERS,
+) -> None:
+    """Create a temporary .txt file in every album dir, wait once, then remove them all.
+
+    The files trigger Navidrome's filesystem watcher for those folders.
+    """
+    marker = f"{uuid.uuid4().hex}.txt"
+    paths = [os.path.join(album_dir, marker) for album_dir in dict.fromkeys(album_dirs)]
+    if not paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        created = [path for path, ok in zip(paths, pool.map(_write_marker, paths)) if ok]
+        try:
+            if created:
+                time.sleep(settle_seconds)
+        finally:
+            list(pool.map(_remove_quietly, created))
+
+
+def start_navidrome_scan(
+    base_url: str,
+    username: str,
+    password: str,
+    session: requests.Session | None = None,
+) -> None:
+    """Ask Navidrome for a library scan through the Subsonic API."""
+    http = session if session is not None else requests
+    salt = secrets.token_hex(8)
+    response = http.get(
+        f"{base_url.rstrip('/')}/rest/startScan",
+        params={
+            "u": username,
+            "t": hashlib.md5((password + salt).encode()).hexdigest(),
+            "s": salt,
+            "v": SUBSONIC_API_VERSION,
+            "c": SUBSONIC_CLIENT,
+            "f": "json",
+        },
+        timeout=30,
     )
     response.raise_for_status()
+    body = response.json().get("subsonic-response", {})
+    if body.get("status") != "ok":
+        error = body.get("error", {})
+        raise RuntimeError(f"startScan failed: {error.get('message', body)}")
+
 
-    content_type = response.headers.get("content-type", "")
-    if not content_type.startswith("image/"):
-        raise ValueError(f"URL did not return an image (content-type: {content_type})")
+def album_dir(music_dir: str, album: AlbumInfo) -> str:
+    return os.path.join(music_dir, album.folder_path, album.folder_name)
 
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    with open(dest_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
 
+def _embedded_pictures(path: str) -> list[tuple[bool, bytes, str]]:
+    """(is_front_cover, data, mime) for every picture in a file's tags.
+
+    MP3s are read through ID3 alone, which stops at the end of the tag
+    instead of syncing to the first audio frame.
+    """
+    # Imported here so --list and the UI run without mutagen installed.
+    import mutagen
+    from mutagen.flac import Picture
+    from mutagen.id3 import ID3
+    from mutagen.mp4 import MP4Cover
+
+    pictures: list[tuple[bool, bytes, str]] = []
+    if path.lower().endswith(".mp3"):
+        try:
+            tags = ID3(path)
+        except Exception:
+            return []
+        for frame in tags.getall("APIC"):
+            pictures.append((frame.type == FRONT_COVER, frame.data, frame.mime))
+        return pictures
 
-def trigger_rescan(album_dir: str) -> None:
-    """Create and remove a temporary .txt file to trigger Navidrome's filesystem watcher."""
-    tmp_file = os.path.join(album_dir, f"{uuid.uuid4().hex}.txt")
     try:
-        with open(tmp_file, "w") as f:
-            f.write("rescan trigger")
-        time.sleep(3)
-    finally:
+        audio = mutagen.File(path)
+    except Exception:
+        return []
+    if audio is None:
+        return []
+
+    for picture in getattr(audio, "pictures", []):  # FLAC
+        pictures.append((picture.type == FRONT_COVER, picture.data, picture.mime))
+    tags = audio.tags
+    if tags is None:
+        return pictures
+    if hasattr(tags, "getall"):  # ID3
+        for frame in tags.getall("APIC"):
+            pictures.append((frame.type == FRONT_COVER, frame.data, frame.mime))
+        return pictures
+    for cover in tags.get("covr", []):  # MP4
+        mime = "image/png" if cover.imageformat == MP4Cover.FORMAT_PNG else "image/jpeg"
+        pictures.append((True, bytes(cover), mime))
+    for encoded in tags.get("metadata_block_picture", []):  # Ogg Vorbis/Opus
+        try:
+            picture = Picture(base64.b64decode(encoded))
+        except Exception:
+            continue
+        pictures.append((picture.type == FRONT_COVER, picture.data, picture.mime))
+    return pictures
+
+
+def _name_hints(filename: str) -> set[str]:
+    return set(re.findall(r"[a-z]+", os.path.splitext(filename)[0].lower()))
+
+
+def _write_cover(dest_dir: str, data: bytes, ext: str) -> str:
+    dest_path = os.path.join(dest_dir, f"folder{ext}")
+    part_path = f"{dest_path}.part"
+    with open(part_path, "wb") as f:
+        f.write(data)
+    os.replace(part_path, dest_path)
+    return dest_path
+
+
+def extract_local_artwork(dest_dir: str) -> str | None:
+    """Save the best artwork already on disk for an album as folder.<ext>.
+
+    Looks at images in the folder and its direct subfolders (e.g. Scans/)
+    and at pictures embedded in the audio files. Cover-named images win,
+    then embedded front covers, then the largest other image in the folder
+    itself that is not a back, disc, inlay or booklet scan.
+    Returns the cover path, or None if nothing was found.
+    """
+    named: list[tuple[int, str]] = []
+    stray: list[tuple[int, str]] = []
+    audio_files: list[str] = []
+    try:
+        entries = sorted(os.scandir(dest_dir), key=lambda entry: entry.name)
+    except OSError:
+        return None
+    subdirs = [entry.path for entry in entries if entry.is_dir()]
+    for entry in entries:
+        ext = os.path.splitext(entry.name)[1].lower()
+        if not entry.is_file():
+            continue
+        if ext in IMAGE_EXTENSIONS:
+            if os.path.splitext(entry.name)[0].lower() == "folder":
+                # Navidrome has not picked it up yet; a rescan is all it needs.
+                return entry.path
+            hints = _name_hints(entry.name)
+            if hints & NON_COVER_NAME_HINTS:
+                continue
+            (named if hints & COVER_NAME_HINTS else stray).append((entry.stat().st_size, entry.path))
+        elif ext in AUDIO_EXTENSIONS:
+            audio_files.append(entry.path)
+    for subdir in subdirs:
         try:
-            os.remove(tmp_file)
+            sub_entries = list(os.scandir(subdir))
         except OSError:
-            pass
+            continue
+        for entry in sub_entries:
+            if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+            hints = _name_hints(entry.name)
+            if hints & COVER_NAME_HINTS and not hints & NON_COVER_NAME_HINTS:
+                named.append((entry.stat().st_size, entry.path))
+
+    if named:
+        _, source = max(named)
+        with open(source, "rb") as f:
+            return _write_cover(dest_dir, f.read(), os.path.splitext(source)[1].lower())
+
+    # Tracks of one album normally share their art, so stop at the first with a picture.
+    for path in audio_files:
+        pictures = [picture for picture in _embedded_pictures(path) if picture[2] in MIME_EXTENSIONS]
+        if pictures:
+            _, data, mime = max(pictures, key=lambda picture: (picture[0], len(picture[1])))
+            return _write_cover(dest_dir, data, MIME_EXTENSIONS[mime])
+
+    if stray:
+        _, source = max(stray)
+        with open(source, "rb") as f:
+            return _write_cover(dest_dir, f.read(), os.path.splitext(source)[1].lower())
+    return None
+
+
+def scan_local_artwork(albums: list[AlbumInfo], music_dir: str, workers: int | None = None) -> dict[str, str]:
+    """Run extract_local_artwork for every album in a process pool; folder_id -> cover path."""
+    dirs = [album_dir(music_dir, album) for album in albums]
+    found: dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for album, cover in zip(albums, pool.map(extract_local_artwork, dirs, chunksize=16)):
+            if cover is not None:
+                found[album.folder_id] = cover
+    return found
+
+
+class RescanScheduler:
+    """Runs rescans on one background thread, coalescing requests.
+
+    Directories requested while a round is running go into the next round,
+    so any number of downloads costs one wait per round rather than one per
+    album. With ``start_scan`` set, a round calls it once instead of touching
+    the folders.
+    """
+
+    def __init__(
+        self,
+        settle_seconds: float = RESCAN_SETTLE_SECONDS,
+        workers: int = RESCAN_WORKERS,
+        start_scan: Callable[[], None] | None = None,
+    ):
+        self.settle_seconds = settle_seconds
+        self.workers = workers
+        self.start_scan = start_scan
+        self._pending: dict[str, None] = {}
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="rescan", daemon=True)
+        self._thread.start()
+
+    def request(self, album_dirs: Iterable[str]) -> None:
+        with self._cond:
+            self._pending.update(dict.fromkeys(album_dirs))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Finish queued rounds (removing their trigger files) and stop."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                album_dirs = list(self._pending)
+                self._pending.clear()
+            try:
+                if self.start_scan is not None:
+                    self.start_scan()
+                else:
+                    trigger_rescans(album_dirs, self.settle_seconds, self.workers)
+            except Exception as e:
+                print(f"Rescan of {len(album_dirs)} folder(s) failed: {e}", file=sys.stderr)
+
+
+@dataclass
+class AlbumRow:
+    """One reusable row of widgets; ``album_idx`` is the album it shows, if any."""
+
+    frame: ttk.Frame
+    info_label: ttk.Label
+    url_var: tk.StringVar
+    url_entry: ttk.Entry
+    album_idx: int | None = None
+    search_url: str = ""
 
 
 class AlbumArtApp:
@@ -155,9 +574,16 @@ class AlbumArtApp:
         ),
     }
 
-    def __init__(self, albums: list[AlbumInfo], music_dir: str):
+    def __init__(
+        self,
+        albums: list[AlbumInfo],
+        music_dir: str,
+        download_workers: int = DOWNLOAD_WORKERS,
+        rescans: RescanScheduler | None = None,
+    ):
         self.albums = albums
         self.music_dir = music_dir
+        self.rescans = rescans if rescans is not None else RescanScheduler()
         self.current_page = 0
         self.total_pages = max(1, ceil(len(self.albums) / self.PAGE_SIZE))
 
@@ -165,11 +591,24 @@ class AlbumArtApp:
         self.root.title(f"Album Art Finder ({len(albums)} albums without art)")
         self.root.geometry("900x700")
 
-        self.album_url_vars = [tk.StringVar(master=self.root) for _ in self.albums]
+        # Only albums someone typed a URL for get an entry.
+        self.album_urls: dict[int, str] = {}
         self.completed_indices: set[int] = set()
-        self.url_entries: list[tuple[int, AlbumInfo, tk.Entry]] = []
+        # PAGE_SIZE rows built once; paging and sorting only refill them.
+        self.rows: list[AlbumRow] = []
         self.sort_var = tk.StringVar(master=self.root, value="Rating")
         self.sorted_album_indices = list(range(len(self.albums)))
+        self._sort_orders: dict[str, list[int]] = {}
+
+        # Downloads run on a bounded pool; workers report (album_idx, error) through
+        # a queue that the Tk loop drains, since Tk must only be touched from here.
+        self.session = make_session(download_workers)
+        self.executor = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="download")
+        self.download_events: queue.SimpleQueue[tuple[int, Exception | None]] = queue.SimpleQueue()
+        self.pending_indices: set[int] = set()
+        self.batch_total = 0
+        self.batch_results: list[str] = []
+        self.batch_rescan: list[str] = []
 
         self._build_ui()
         self._apply_sort(reset_page=False)
@@ -237,20 +676,25 @@ class AlbumArtApp:
         self.status_label = ttk.Label(bottom_frame, text="", wraplength=700)
         self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        go_button = ttk.Button(
+        self.go_button = ttk.Button(
             bottom_frame, text="Go!", command=self._on_go, padding=(20, 5)
         )
-        go_button.pack(side=tk.RIGHT)
+        self.go_button.pack(side=tk.RIGHT)
+
+        for _ in range(min(self.PAGE_SIZE, len(self.albums))):
+            self.rows.append(self._build_album_row())
 
     def _apply_sort(self, reset_page: bool = True):
         sort_label = self.sort_var.get()
-        key_func = self.SORT_OPTIONS.get(sort_label, self.SORT_OPTIONS["Rating"])
-        reverse = sort_label in {"Rating", "Playcount"}
-        self.sorted_album_indices = sorted(
-            range(len(self.albums)),
-            key=lambda idx: key_func(self.albums[idx]),
-            reverse=reverse,
-        )
+        if sort_label not in self._sort_orders:
+            key_func = self.SORT_OPTIONS.get(sort_label, self.SORT_OPTIONS["Rating"])
+            reverse = sort_label in {"Rating", "Playcount"}
+            self._sort_orders[sort_label] = sorted(
+                range(len(self.albums)),
+                key=lambda idx: key_func(self.albums[idx]),
+                reverse=reverse,
+            )
+        self.sorted_album_indices = self._sort_orders[sort_label]
 
         if reset_page:
             self.current_page = 0
@@ -261,21 +705,20 @@ class AlbumArtApp:
         self._apply_sort(reset_page=True)
 
     def _render_page(self):
-        for child in self.scrollable_frame.winfo_children():
-            child.destroy()
-
-        self.url_entries.clear()
         start = self.current_page * self.PAGE_SIZE
         end = min(start + self.PAGE_SIZE, len(self.sorted_album_indices))
 
-        for display_idx in range(start, end):
-            album_idx = self.sorted_album_indices[display_idx]
-            self._add_album_row(
-                album_idx,
-                display_idx,
-                self.albums[album_idx],
-                self.album_url_vars[album_idx],
-            )
+        for slot, row in enumerate(self.rows):
+            display_idx = start + slot
+            if display_idx < end:
+                album_idx = self.sorted_album_indices[display_idx]
+                self._fill_album_row(row, album_idx, display_idx)
+                if not row.frame.winfo_manager():
+                    # Hidden rows are always the tail, so re-packing keeps the order.
+                    row.frame.pack(fill=tk.X, pady=2, padx=5)
+            elif row.album_idx is not None:
+                row.album_idx = None
+                row.frame.pack_forget()
 
         self.page_label.config(
             text=(
@@ -301,96 +744,175 @@ class AlbumArtApp:
         self.current_page += 1
         self._render_page()
 
-    def _add_album_row(
-        self,
-        album_idx: int,
-        display_idx: int,
-        album: AlbumInfo,
-        url_var: tk.StringVar,
-    ):
+    def _build_album_row(self) -> AlbumRow:
         frame = ttk.Frame(self.scrollable_frame)
-        frame.pack(fill=tk.X, pady=2, padx=5)
 
         # Row 1: Album info + search link
         info_frame = ttk.Frame(frame)
         info_frame.pack(fill=tk.X)
 
-        label_text = (
-            f"[{display_idx + 1}] {album.artist} - {album.album}  "
-            f"({album.rated_songs} rated, {album.played_songs} played"
-        )
-        if album.total_rating > 0:
-            label_text += f", rating sum: {album.total_rating}"
-        if album.total_plays > 0:
-            label_text += f", play sum: {album.total_plays}"
-        label_text += ")"
-
-        info_label = ttk.Label(info_frame, text=label_text, font=("TkDefaultFont", 11, "bold"))
+        info_label = ttk.Label(info_frame, text="", font=("TkDefaultFont", 11, "bold"))
         info_label.pack(side=tk.LEFT)
 
-        search_url = make_search_url(album.artist, album.album)
         link_label = ttk.Label(
             info_frame, text="\U0001f50d Search", foreground="blue", cursor="hand2"
         )
         link_label.pack(side=tk.LEFT, padx=(10, 0))
-        link_label.bind("<Button-1>", lambda e, url=search_url: webbrowser.open(url))
 
         # Row 2: URL entry
         entry_frame = ttk.Frame(frame)
         entry_frame.pack(fill=tk.X, pady=(2, 0))
 
         ttk.Label(entry_frame, text="Image URL:").pack(side=tk.LEFT)
+        url_var = tk.StringVar(master=self.root)
         url_entry = ttk.Entry(entry_frame, textvariable=url_var)
         url_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
 
-        if album_idx in self.completed_indices:
-            url_entry.config(state="readonly")
+        # Separator
+        ttk.Separator(frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=(5, 0))
+
+        row = AlbumRow(frame=frame, info_label=info_label, url_var=url_var, url_entry=url_entry)
+        link_label.bind("<Button-1>", lambda e: webbrowser.open(row.search_url))
+        url_var.trace_add("write", lambda *_: self._store_url(row))
+        return row
+
+    def _fill_album_row(self, row: AlbumRow, album_idx: int, display_idx: int):
+        album = self.albums[album_idx]
+        label_text = (
+            f"[{display_idx + 1}] {album.artist} - {album.album}  "
+            f"({album.rated_songs} rated, {album.played_songs} played"
+        )
+        if album.total_rating > 0:
+            label_text += f", rating sum: {album.total_rating}"
+        if album.total_plays > 0:
+            label_text += f", play sum: {album.total_plays}"
+        label_text += ")"
+        row.info_label.config(text=label_text)
+        row.search_url = make_search_url(album.artist, album.album)
+
+        row.album_idx = album_idx
+        done = album_idx in self.completed_indices
+        row.url_entry.config(state="normal")
+        row.url_var.set("\u2713 Done" if done else self.album_urls.get(album_idx, ""))
+        if done or album_idx in self.pending_indices:
+            row.url_entry.config(state="readonly")
+
+    def _store_url(self, row: AlbumRow):
+        idx = row.album_idx
+        if idx is None or idx in self.completed_indices:
+            return
+        url = row.url_var.get()
+        if url:
+            self.album_urls[idx] = url
         else:
-            url_entry.config(state="normal")
+            self.album_urls.pop(idx, None)
 
-        self.url_entries.append((album_idx, album, url_entry))
+    def _visible_row(self, album_idx: int) -> AlbumRow | None:
+        for row in self.rows:
+            if row.album_idx == album_idx:
+                return row
+        return None
 
-        # Separator
-        ttk.Separator(frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=(5, 0))
+    def _album_dir(self, album: AlbumInfo) -> str:
+        return album_dir(self.music_dir, album)
 
     def _on_go(self):
-        results = []
-        to_rescan: list[str] = []
+        if self.pending_indices:
+            return
 
-        for idx, album in enumerate(self.albums):
+        jobs: list[tuple[int, str]] = []
+        for idx, url in sorted(self.album_urls.items()):
             if idx in self.completed_indices:
                 continue
+            url = url.strip()
+            if url:
+                jobs.append((idx, url))
 
-            url = self.album_url_vars[idx].get().strip()
-            if not url:
-                continue
+        if not jobs:
+            messagebox.showwarning("No URLs", "No image URLs were entered.")
+            return
 
-            album_dir = os.path.join(self.music_dir, album.folder_path, album.folder_name)
-            dest_path = os.path.join(album_dir, "folder.jpg")
+        self.batch_total = len(jobs)
+        self.batch_results = []
+        self.batch_rescan = []
+        for idx, url in jobs:
+            self.pending_indices.add(idx)
+            dest_path = os.path.join(self._album_dir(self.albums[idx]), "folder.jpg")
+            self.executor.submit(self._download, idx, url, dest_path)
+
+        self.go_button.config(state="disabled")
+        self._set_entry_states()
+        self._show_progress()
+        self.root.after(POLL_INTERVAL_MS, self._poll_downloads)
+
+    def _download(self, idx: int, url: str, dest_path: str) -> None:
+        # Runs on a worker thread.
+        try:
+            download_image(url, dest_path, self.session)
+        except Exception as e:
+            self.download_events.put((idx, e))
+        else:
+            self.download_events.put((idx, None))
 
+    def _poll_downloads(self):
+        landed = False
+        while True:
             try:
-                download_image(url, dest_path)
-                results.append(f"\u2713 {album.artist} - {album.album}")
-                to_rescan.append(album_dir)
+                idx, error = self.download_events.get_nowait()
+            except queue.Empty:
+                break
+            landed = True
+            album = self.albums[idx]
+            self.pending_indices.discard(idx)
+            if error is None:
                 self.completed_indices.add(idx)
-                self.album_url_vars[idx].set("\u2713 Done")
-            except Exception as e:
-                results.append(f"\u2717 {album.artist} - {album.album}: {e}")
+                self.album_urls.pop(idx, None)
+                row = self._visible_row(idx)
+                if row is not None:
+                    row.url_var.set("\u2713 Done")
+                self.batch_results.append(f"\u2713 {album.artist} - {album.album}")
+                self.batch_rescan.append(self._album_dir(album))
+            else:
+                self.batch_results.append(f"\u2717 {album.artist} - {album.album}: {error}")
+
+        if landed:
+            self._set_entry_states()
+            self._show_progress()
+        if self.pending_indices:
+            self.root.after(POLL_INTERVAL_MS, self._poll_downloads)
+        else:
+            self._finish_batch()
 
-        self._render_page()
+    def _set_entry_states(self):
+        for row in self.rows:
+            if row.album_idx is None:
+                continue
+            locked = row.album_idx in self.completed_indices or row.album_idx in self.pending_indices
+            row.url_entry.config(state="readonly" if locked else "normal")
+
+    def _show_progress(self):
+        done = self.batch_total - len(self.pending_indices)
+        failed = sum(1 for line in self.batch_results if line.startswith("\u2717"))
+        self.status_label.config(
+            text=f"Downloading {done}/{self.batch_total} ({failed} failed)..."
+        )
 
-        # Trigger rescans in parallel
-        if to_rescan:
-            ThreadPoolExecutor(max_workers=len(to_rescan)).map(trigger_rescan, to_rescan)
+    def _finish_batch(self):
+        self.go_button.config(state="normal")
 
-        if results:
-            self.status_label.config(text="\n".join(results))
-            messagebox.showinfo("Done", f"Processed {len(results)} album(s).")
-        else:
-            messagebox.showwarning("No URLs", "No image URLs were entered.")
+        if self.batch_rescan:
+            self.rescans.request(self.batch_rescan)
+
+        self.status_label.config(text="\n".join(self.batch_results))
+        messagebox.showinfo("Done", f"Processed {len(self.batch_results)} album(s).")
 
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.session.close()
+            self.rescans.close()
 
 
 def main() -> None:
@@ -404,21 +926,117 @@ def main() -> None:
     )
     parser.add_argument(
         "--music-dir", "-m",
-        required=True,
-        help="Root path of the music library on this machine",
+        default=None,
+        help="Root path of the music library on this machine (required for the GUI)",
+    )
+    parser.add_argument(
+        "--list",
+        choices=["csv", "json"],
+        default=None,
+        help="Print the ranked albums to stdout in this format instead of opening the GUI",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="Per-folder result cache so repeat runs only requery changed folders (default: <db>.art-cache.json)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run the full query and leave the cache untouched",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help=f"Artwork downloads to run at once (default: {DOWNLOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--rescan-delay",
+        type=float,
+        default=RESCAN_SETTLE_SECONDS,
+        help=f"Seconds to leave rescan trigger files in place (default: {RESCAN_SETTLE_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--rescan-workers",
+        type=int,
+        default=RESCAN_WORKERS,
+        help=f"Folders to touch at once when triggering rescans (default: {RESCAN_WORKERS})",
+    )
+    parser.add_argument(
+        "--navidrome-url",
+        default=None,
+        help="Trigger rescans with the Subsonic startScan endpoint of this server instead of trigger files",
+    )
+    parser.add_argument(
+        "--navidrome-user",
+        default=None,
+        help="Admin user for --navidrome-url",
+    )
+    parser.add_argument(
+        "--navidrome-password",
+        default=os.environ.get("NAVIDROME_PASSWORD"),
+        help="Password for --navidrome-user (default: $NAVIDROME_PASSWORD)",
+    )
+    parser.add_argument(
+        "--scan-local",
+        action="store_true",
+        help="First save artwork already on disk (embedded or stray images) as folder.<ext> and skip those albums",
+    )
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=None,
+        help="Processes for --scan-local (default: one per CPU)",
     )
     args = parser.parse_args()
+    if args.download_workers < 1:
+        parser.error("--download-workers must be at least 1")
+    if args.rescan_workers < 1:
+        parser.error("--rescan-workers must be at least 1")
+    start_scan = None
+    if args.navidrome_url:
+        if not args.navidrome_user or args.navidrome_password is None:
+            parser.error("--navidrome-url needs --navidrome-user and --navidrome-password")
+        start_scan = partial(
+            start_navidrome_scan,
+            args.navidrome_url,
+            args.navidrome_user,
+            args.navidrome_password,
+        )
+
+    if args.list is None and not args.music_dir:
+        parser.error("--music-dir is required unless --list is given")
+    if args.scan_local and not args.music_dir:
+        parser.error("--scan-local needs --music-dir")
+    if args.scan_workers is not None and args.scan_workers < 1:
+        parser.error("--scan-workers must be at least 1")
 
     if not os.path.isfile(args.db):
         raise SystemExit(f"Error: Database not found: {args.db}")
 
-    albums = query_albums_without_art(args.db)
-    if not albums:
-        print("No albums found without cover art!")
-        return
+    cache_path = None if args.no_cache else (args.cache or f"{args.db}.art-cache.json")
+    albums = query_albums_without_art(args.db, cache_path)
+    rescans = RescanScheduler(args.rescan_delay, args.rescan_workers, start_scan)
+    try:
+        if args.scan_local and albums:
+            found = scan_local_artwork(albums, args.music_dir, args.scan_workers)
+            print(f"Found artwork on disk for {len(found)} of {len(albums)} album(s)", file=sys.stderr)
+            if found:
+                rescans.request(album_dir(args.music_dir, album) for album in albums if album.folder_id in found)
+                albums = [album for album in albums if album.folder_id not in found]
+
+        if args.list is not None:
+            write_album_list(albums, args.list, sys.stdout)
+            return
+        if not albums:
+            print("No albums found without cover art!")
+            return
 
-    app = AlbumArtApp(albums, args.music_dir)
-    app.run()
+        app = AlbumArtApp(albums, args.music_dir, args.download_workers, rescans)
+        app.run()
+    finally:
+        rescans.close()
 
 
 if __name__ == "__main__":
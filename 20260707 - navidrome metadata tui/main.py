@@ -9,18 +9,38 @@
 
 from __future__ import annotations
 
+import csv
+import json
+import queue
 import sqlite3
-from dataclasses import dataclass
+import string
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal, TextIO
 
 import click
+from rich.cells import set_cell_size
+from rich.segment import Segment
+from rich.style import Style
 from textual import events
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Vertical
+from textual.geometry import Size
+from textual.message import Message
 from textual.screen import ModalScreen
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 from textual.timer import Timer
 from textual.widgets import (
     Button,
@@ -39,12 +59,25 @@ from textual.widgets import (
 SearchScope = Literal["all", "artist", "album", "track"]
 TransferMode = Literal["playcount", "rating", "playcount_and_rating"]
 SortField = Literal["id", "artist", "album", "title", "rating", "play_count"]
+SeekKey = tuple[object, ...]
+# (user_id, term, scope, sort_field, sort_desc, page_size, after)
+PageKey = tuple[str, str, SearchScope, SortField, bool, int, SeekKey | None]
+CountMode = Literal["exact", "lazy", "capped"]
 
 DEFAULT_LIMIT = 500
 MIN_WIDTH = 120
 MIN_HEIGHT = 36
 TRACK_ITEM_TYPE_CANDIDATES: tuple[str, ...] = ("track", "media_file", "song")
 DEFAULT_PAGE_SIZE = 200
+COUNT_CAP = 10_000
+DUPLICATE_DURATION_TOLERANCE = 2.0
+TRACK_CACHE_SIZE = 5_000
+PAGE_CACHE_SIZE = 8
+PREFETCH_CHANNELS = ("prefetch-next", "prefetch-prev")
+# Snapshot mode: read connection tuning and how long writes wait for Navidrome's lock.
+SNAPSHOT_MMAP_SIZE = 256 * 1024 * 1024
+SNAPSHOT_CACHE_SIZE_KIB = 64 * 1024
+WRITE_BUSY_TIMEOUT = 5.0
 
 COLUMN_DEFS: list[tuple[str, str, int]] = [
     ("id", "ID", 16),
@@ -55,6 +88,43 @@ COLUMN_DEFS: list[tuple[str, str, int]] = [
     ("play_count", "Playcount", 10),
 ]
 
+SCOPE_FIELDS: dict[SearchScope, tuple[str, ...]] = {
+    "artist": ("artist", "order_artist_name", "sort_artist_name"),
+    "album": ("album", "order_album_name", "sort_album_name"),
+    "track": ("title", "order_title", "sort_title"),
+    "all": ("artist", "album", "title", "full_text"),
+}
+SORT_TIEBREAKERS: tuple[str, ...] = (
+    "COALESCE(mf.order_artist_name, '')",
+    "COALESCE(mf.order_album_name, '')",
+    "COALESCE(mf.disc_number, 0)",
+    "COALESCE(mf.track_number, 0)",
+    "mf.id",
+)
+RATING_SORT_EXPR = "COALESCE(NULLIF(ann.rating, 0), CAST(ROUND(mf.average_rating) AS INTEGER), 0)"
+SORT_ORDER_MAP: dict[SortField, str] = {
+    "id": "mf.id",
+    "artist": "mf.order_artist_name",
+    "album": "mf.order_album_name",
+    "title": "COALESCE(NULLIF(mf.sort_title, ''), mf.order_title)",
+    "rating": RATING_SORT_EXPR,
+    "play_count": "COALESCE(ann.play_count, 0)",
+}
+SEARCH_INDEX_COLUMNS: tuple[str, ...] = tuple(
+    dict.fromkeys(field for fields in SCOPE_FIELDS.values() for field in fields)
+)
+
+
+UPSERT_TRACK_ANNOTATION_SQL = """
+    INSERT INTO annotation (user_id, item_id, item_type, play_count, rating, play_date, rated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, item_id, item_type) DO UPDATE SET
+        play_count = excluded.play_count,
+        rating = excluded.rating,
+        play_date = excluded.play_date,
+        rated_at = excluded.rated_at
+"""
+
 
 def truncate_for_column(value: str, width: int) -> str:
     if len(value) <= width:
@@ -102,13 +172,551 @@ class TrackRow:
     album_id: str
 
 
+@dataclass(slots=True)
+class SearchResult:
+    rows: list[TrackRow]
+    # None when the total was not requested; at most count_limit + 1 when capped.
+    total: int | None
+    # Sort key of the last row; pass as ``after`` to fetch the following page.
+    last_key: SeekKey | None
+    has_more: bool
+
+
+def seek_clause(primary: str, sort_desc: bool, key: SeekKey) -> tuple[str, list[object]]:
+    """WHERE clause selecting rows strictly after ``key`` in search_tracks order."""
+    primary_value, *tie_values = key
+    tiebreak_sql = (
+        "(" + ", ".join(SORT_TIEBREAKERS) + ") > (" + ", ".join("?" for _ in SORT_TIEBREAKERS) + ")"
+    )
+    if primary_value is None:
+        if sort_desc:
+            return (f"({primary} IS NULL AND {tiebreak_sql})", [*tie_values])
+        return (
+            f"({primary} IS NOT NULL OR ({primary} IS NULL AND {tiebreak_sql}))",
+            [*tie_values],
+        )
+    if sort_desc:
+        return (
+            f"({primary} < ? OR {primary} IS NULL OR ({primary} = ? AND {tiebreak_sql}))",
+            [primary_value, primary_value, *tie_values],
+        )
+    return (
+        f"({primary} > ? OR ({primary} = ? AND {tiebreak_sql}))",
+        [primary_value, primary_value, *tie_values],
+    )
+
+
+# LIKE ... COLLATE NOCASE only folds ASCII letters.
+NOCASE_FOLD = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def search_terms(term: str) -> list[str]:
+    return [part for part in term.strip().split() if part] or [""]
+
+
+def refines_search(previous: Collection[str], terms: Collection[str]) -> bool:
+    """True if every match for ``terms`` also matches ``previous``."""
+    return all(any(old in new for new in terms) for old in previous)
+
+
+@dataclass(slots=True)
+class TrackAnnotation:
+    item_type: str
+    play_count: int
+    rating: int
+    play_date: datetime | None
+    rated_at: str | None
+
+
+@dataclass(slots=True)
+class BulkTransferResult:
+    pairs: int
+    tracks: int
+    albums: int
+
+
+def apply_transfer(
+    source: TrackAnnotation,
+    target: TrackAnnotation,
+    mode: TransferMode,
+) -> tuple[TrackAnnotation, TrackAnnotation]:
+    new_source = replace(source)
+    new_target = replace(target)
+
+    if mode in ("playcount", "playcount_and_rating"):
+        new_target.play_count = target.play_count + source.play_count
+        new_source.play_count = 0
+        if source.play_date is not None:
+            if target.play_date is None or target.play_date <= source.play_date:
+                new_target.play_date = source.play_date
+        new_source.play_date = None
+
+    if mode in ("rating", "playcount_and_rating"):
+        new_target.rating = source.rating
+        new_source.rating = 0
+        new_target.rated_at = source.rated_at
+        new_source.rated_at = None
+
+    return new_source, new_target
+
+
+def load_transfer_pairs(path: Path) -> list[tuple[str, str]]:
+    """Read (source_id, target_id) pairs from a JSON list or a CSV file."""
+    if path.suffix.lower() == ".json":
+        entries = json.loads(path.read_text(encoding="utf-8"))
+        pairs: list[tuple[str, str]] = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                pairs.append((str(entry["source_id"]), str(entry["target_id"])))
+            else:
+                source_id, target_id = entry
+                pairs.append((str(source_id), str(target_id)))
+        return pairs
+
+    with path.open(newline="", encoding="utf-8") as handle:
+        rows = [row for row in csv.reader(handle) if any(cell.strip() for cell in row)]
+    if rows and [cell.strip() for cell in rows[0][:2]] == ["source_id", "target_id"]:
+        rows = rows[1:]
+    return [(row[0].strip(), row[1].strip()) for row in rows]
+
+
+@dataclass(slots=True)
+class DuplicateGroup:
+    artist: str
+    album: str
+    title: str
+    tracks: list[TrackRow]
+
+
+@lru_cache(maxsize=65536)
+def normalize_match_text(value: str) -> str:
+    """Casefold, strip accents and punctuation, and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    kept = "".join(
+        char if char.isalnum() else " " for char in decomposed if not unicodedata.combining(char)
+    )
+    return " ".join(kept.split())
+
+
+def cluster_by_duration(
+    entries: list[tuple[float, str]],
+    tolerance: float,
+) -> list[list[str]]:
+    """Split (duration, id) entries into clusters of two or more with neighbours within ``tolerance``."""
+    clusters: list[list[str]] = []
+    current: list[tuple[float, str]] = []
+    for entry in sorted(entries):
+        if current and entry[0] - current[-1][0] > tolerance:
+            if len(current) > 1:
+                clusters.append([track_id for _, track_id in current])
+            current = []
+        current.append(entry)
+    if len(current) > 1:
+        clusters.append([track_id for _, track_id in current])
+    return clusters
+
+
+def duplicate_rank(track: TrackRow) -> tuple[int, int, str]:
+    return (-track.play_count, -track.rating, track.id)
+
+
+def default_search_index_path(db_path: Path) -> Path:
+    return db_path.with_name(f"{db_path.stem}.search.db")
+
+
+class ProfiledCursor:
+    """Rows of a profiled query, fetched up front so the fetch is timed too."""
+
+    def __init__(self, rows: list[Any], rowcount: int) -> None:
+        self._rows = rows
+        self._position = 0
+        self.rowcount = rowcount
+
+    def __iter__(self) -> ProfiledCursor:
+        return self
+
+    def __next__(self) -> Any:
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def fetchone(self) -> Any:
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchall(self) -> list[Any]:
+        rows = self._rows[self._position :]
+        self._position = len(self._rows)
+        return rows
+
+
+class QueryProfiler:
+    """Records wall time, row count and query plan of every statement, optionally to a JSONL log."""
+
+    PLANNED_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+    def __init__(self, log: TextIO | None = None) -> None:
+        self.log = log
+        self.last: dict[str, Any] | None = None
+        self.last_by_caller: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._plans: dict[str, list[str]] = {}
+
+    def _plan(self, conn: sqlite3.Connection, sql: str, parameters: Any) -> list[str] | None:
+        if not sql.lstrip().upper().startswith(self.PLANNED_STATEMENTS):
+            return None
+        if (cached := self._plans.get(sql)) is not None:
+            return cached
+        try:
+            rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error:
+            return None
+        depths: dict[int, int] = {0: -1}
+        plan: list[str] = []
+        for node_id, parent_id, _, detail in rows:
+            depths[node_id] = depths.get(parent_id, -1) + 1
+            plan.append("  " * depths[node_id] + detail)
+        self._plans[sql] = plan
+        return plan
+
+    def run(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        parameters: Any,
+        many: bool = False,
+    ) -> sqlite3.Cursor | ProfiledCursor:
+        # Two frames up is the repository method that issued the statement.
+        caller = sys._getframe(2).f_code.co_qualname
+        batch = list(parameters) if many else None
+        if batch is not None:
+            plan = self._plan(conn, sql, batch[0]) if batch else None
+        else:
+            plan = self._plan(conn, sql, parameters)
+        record: dict[str, Any] = {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "thread": threading.current_thread().name,
+            "caller": caller,
+            "sql": " ".join(sql.split()),
+        }
+        if batch is not None:
+            record["batch"] = len(batch)
+        started = time.perf_counter()
+        try:
+            if batch is not None:
+                result: sqlite3.Cursor | ProfiledCursor = sqlite3.Connection.executemany(conn, sql, batch)
+                rows = result.rowcount
+            else:
+                cursor = sqlite3.Connection.execute(conn, sql, parameters)
+                if cursor.description is None:
+                    result = cursor
+                    rows = cursor.rowcount
+                else:
+                    fetched = cursor.fetchall()
+                    result = ProfiledCursor(fetched, cursor.rowcount)
+                    rows = len(fetched)
+        except sqlite3.Error as exc:
+            record["error"] = str(exc)
+            raise
+        else:
+            record["rows"] = rows
+        finally:
+            record["seconds"] = round(time.perf_counter() - started, 6)
+            record["plan"] = plan
+            self._write(record)
+        return result
+
+    def _write(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self.last = record
+            self.last_by_caller[record["caller"]] = record
+            if self.log is not None:
+                self.log.write(json.dumps(record) + "\n")
+                self.log.flush()
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """Connection that routes execute/executemany through a QueryProfiler."""
+
+    profiler: QueryProfiler | None = None
+
+    def execute(self, sql: str, parameters: Any = (), /) -> Any:
+        if self.profiler is None:
+            return super().execute(sql, parameters)
+        return self.profiler.run(self, sql, parameters)
+
+    def executemany(self, sql: str, parameters: Any, /) -> Any:
+        if self.profiler is None:
+            return super().executemany(sql, parameters)
+        return self.profiler.run(self, sql, parameters, many=True)
+
+
+def sort_index_statement(sort_field: SortField, sort_desc: bool) -> str | None:
+    """CREATE INDEX on the sort keys of search_tracks' ORDER BY for one sort, if media_file can hold it."""
+    primary = SORT_ORDER_MAP[sort_field]
+    if "ann." in primary:
+        return None
+    direction = " DESC" if sort_desc else ""
+    columns = ", ".join(term.replace("mf.", "") for term in (f"{primary}{direction}", *SORT_TIEBREAKERS))
+    name = f"media_file_sort_{sort_field}_{'desc' if sort_desc else 'asc'}"
+    return f"CREATE INDEX IF NOT EXISTS {name} ON media_file ({columns}) WHERE missing = FALSE"
+
+
+def profile_sort_orders(
+    repo: NavidromeRepository,
+    user_id: str,
+) -> dict[tuple[SortField, bool], dict[str, Any]]:
+    """Profile the first page of an unfiltered search in every sort order."""
+    if repo.profiler is None:
+        raise ValueError("Repository has no profiler")
+    records: dict[tuple[SortField, bool], dict[str, Any]] = {}
+    for sort_field in SORT_ORDER_MAP:
+        for sort_desc in (False, True):
+            repo.profiler.last_by_caller.pop("NavidromeRepository.search_tracks", None)
+            repo.search_tracks(user_id, "", "all", sort_field=sort_field, sort_desc=sort_desc, include_total=False)
+            # The page query; search_tracks also refreshes the page's annotations.
+            record = repo.profiler.last_by_caller.get("NavidromeRepository.search_tracks")
+            if record is not None:
+                records[(sort_field, sort_desc)] = record
+    return records
+
+
+class SearchIndex:
+    """FTS5 trigram shadow of media_file, attached as ``search`` from a sidecar file."""
+
+    SCHEMA_VERSION = "2"
+    MIN_TERM_LENGTH = 3
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        conn.execute("ATTACH DATABASE ? AS search", (str(self.path),))
+
+    def _source_fingerprint(self, conn: sqlite3.Connection) -> str:
+        row = conn.execute(
+            """
+            SELECT COUNT(*) AS n, MAX(updated_at) AS updated, SUM(missing) AS missing
+            FROM main.media_file
+            """
+        ).fetchone()
+        return f"{self.SCHEMA_VERSION}:{row[0]}:{row[1]}:{row[2]}"
+
+    def _stored_fingerprint(self, conn: sqlite3.Connection) -> str | None:
+        table = conn.execute(
+            "SELECT 1 FROM search.sqlite_master WHERE type = 'table' AND name = 'index_meta'"
+        ).fetchone()
+        if not table:
+            return None
+        row = conn.execute(
+            "SELECT value FROM search.index_meta WHERE key = 'fingerprint'"
+        ).fetchone()
+        return str(row[0]) if row else None
+
+    def ensure_fresh(self, conn: sqlite3.Connection) -> bool:
+        """Rebuild the index if media_file changed since the last build."""
+        fingerprint = self._source_fingerprint(conn)
+        if self._stored_fingerprint(conn) == fingerprint:
+            return False
+        self.rebuild(conn, fingerprint)
+        return True
+
+    def rebuild(self, conn: sqlite3.Connection, fingerprint: str | None = None) -> None:
+        if fingerprint is None:
+            fingerprint = self._source_fingerprint(conn)
+        columns = ", ".join(SEARCH_INDEX_COLUMNS)
+        sources = ", ".join(f"lower(COALESCE({column}, ''))" for column in SEARCH_INDEX_COLUMNS)
+        conn.execute("DROP TABLE IF EXISTS search.track_fts")
+        conn.execute("DROP TABLE IF EXISTS search.index_meta")
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE search.track_fts USING fts5(
+                id UNINDEXED,
+                {columns},
+                tokenize = 'trigram case_sensitive 1'
+            )
+            """
+        )
+        conn.execute("CREATE TABLE search.index_meta (key TEXT PRIMARY KEY, value TEXT)")
+        with conn:
+            conn.execute(
+                f"""
+                INSERT INTO search.track_fts (id, {columns})
+                SELECT id, {sources}
+                FROM main.media_file
+                WHERE missing = FALSE
+                """
+            )
+            conn.execute(
+                "INSERT INTO search.index_meta (key, value) VALUES ('fingerprint', ?)",
+                (fingerprint,),
+            )
+
+    def can_serve(self, terms: list[str]) -> bool:
+        return all(len(term) >= self.MIN_TERM_LENGTH for term in terms)
+
+    def match_expression(self, terms: list[str], scope: SearchScope) -> str:
+        columns = " ".join(SCOPE_FIELDS[scope])
+        phrases = ['"' + term.translate(NOCASE_FOLD).replace('"', '""') + '"' for term in terms]
+        return " AND ".join(f"{{{columns}}} : {phrase}" for phrase in phrases)
+
+
+class TrackRowCache:
+    """Thread-safe LRU of TrackRow keyed by (user_id, track_id)."""
+
+    def __init__(self, maxsize: int = TRACK_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._rows: OrderedDict[tuple[str, str], TrackRow] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, track_id: str) -> TrackRow | None:
+        key = (user_id, track_id)
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                self._rows.move_to_end(key)
+            return row
+
+    def put_many(self, user_id: str, rows: Iterable[TrackRow]) -> None:
+        with self._lock:
+            for row in rows:
+                key = (user_id, row.id)
+                self._rows[key] = row
+                self._rows.move_to_end(key)
+            while len(self._rows) > self.maxsize:
+                self._rows.popitem(last=False)
+
+    def invalidate(self, user_id: str, track_ids: Iterable[str]) -> None:
+        with self._lock:
+            for track_id in track_ids:
+                self._rows.pop((user_id, track_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+
+class PageCache:
+    """LRU of fetched result pages, keyed by query and seek position."""
+
+    def __init__(self, maxsize: int = PAGE_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._pages: OrderedDict[PageKey, SearchResult] = OrderedDict()
+
+    def __contains__(self, key: PageKey) -> bool:
+        return key in self._pages
+
+    def get(self, key: PageKey) -> SearchResult | None:
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+        return page
+
+    def put(self, key: PageKey, page: SearchResult) -> None:
+        self._pages[key] = page
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.maxsize:
+            self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+
 class NavidromeRepository:
-    def __init__(self, db_path: Path) -> None:
+    """Annotation queries and writes for one Navidrome user database."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        track_cache: TrackRowCache | None = None,
+        profiler: QueryProfiler | None = None,
+        snapshot: bool = False,
+        incremental_search: bool = False,
+    ) -> None:
         self.db_path = db_path
-        self._conn = sqlite3.connect(str(db_path))
+        # Shared with clones so the UI thread can read rows loaded by a worker.
+        self.track_cache = track_cache if track_cache is not None else TrackRowCache()
+        self.profiler = profiler
+        self.snapshot = snapshot
+        if snapshot:
+            self._conn = sqlite3.connect(
+                f"{db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                factory=ProfilingConnection,
+            )
+            self._conn.execute("PRAGMA query_only = ON")
+            self._conn.execute(f"PRAGMA mmap_size = {SNAPSHOT_MMAP_SIZE}")
+            self._conn.execute(f"PRAGMA cache_size = -{SNAPSHOT_CACHE_SIZE_KIB}")
+        else:
+            self._conn = sqlite3.connect(str(db_path), factory=ProfilingConnection)
+        self._conn.profiler = profiler
         self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA foreign_keys = ON")
         self.track_item_type = self._detect_track_item_type()
+        self.search_index: SearchIndex | None = None
+        self._resolved_user_id: str | None = None
+        self.incremental_search = incremental_search
+        # (folded terms, scope) held in temp.search_candidates, and its row count.
+        self._candidate_query: tuple[frozenset[str], SearchScope] | None = None
+        self._candidate_count = 0
+
+    def _open_write_connection(self) -> ProfilingConnection:
+        conn = sqlite3.connect(str(self.db_path), timeout=WRITE_BUSY_TIMEOUT, factory=ProfilingConnection)
+        conn.profiler = self.profiler
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(WRITE_BUSY_TIMEOUT * 1000)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """Transaction for annotation writes; a separate read-write connection in snapshot mode."""
+        if not self.snapshot:
+            with self._conn:
+                yield self._conn
+            return
+        conn = self._open_write_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _temp_writes(self) -> Iterator[None]:
+        """Allow TEMP table maintenance on a snapshot connection."""
+        if not self.snapshot:
+            yield
+            return
+        self._conn.execute("PRAGMA query_only = OFF")
+        try:
+            yield
+        finally:
+            self._conn.execute("PRAGMA query_only = ON")
+
+    def enable_search_index(self, index: SearchIndex) -> bool:
+        """Attach the FTS sidecar, rebuilding it if stale. Returns True if rebuilt."""
+        if self.snapshot:
+            conn = self._open_write_connection()
+            try:
+                index.attach(conn)
+                rebuilt = index.ensure_fresh(conn)
+            finally:
+                conn.close()
+            index.attach(self._conn)
+        else:
+            index.attach(self._conn)
+            rebuilt = index.ensure_fresh(self._conn)
+        self.search_index = index
+        return rebuilt
 
     def _detect_track_item_type(self) -> str:
         placeholders = ",".join("?" for _ in TRACK_ITEM_TYPE_CANDIDATES)
@@ -127,6 +735,24 @@ class NavidromeRepository:
             return "track"
         return str(row["item_type"])
 
+    def clone(self) -> NavidromeRepository:
+        """Open another repository on the same database (and search index)."""
+        other = NavidromeRepository(
+            self.db_path,
+            track_cache=self.track_cache,
+            profiler=self.profiler,
+            snapshot=self.snapshot,
+            incremental_search=self.incremental_search,
+        )
+        if self.search_index is not None:
+            self.search_index.attach(other._conn)
+            other.search_index = self.search_index
+        return other
+
+    def interrupt(self) -> None:
+        """Abort the statement running on this connection; safe from any thread."""
+        self._conn.interrupt()
+
     def close(self) -> None:
         self._conn.close()
 
@@ -163,91 +789,60 @@ class NavidromeRepository:
             return None
         return (row["id"], row["user_name"])
 
-    def search_tracks(
+    def reload_annotations(self) -> None:
+        """Drop the resolved annotation table so it is rebuilt on next use."""
+        self._resolved_user_id = None
+        self._candidate_query = None
+        self.track_cache.clear()
+
+    def _ensure_resolved_annotations(self, user_id: str) -> None:
+        # One row per track holding the user's highest-priority annotation.
+        if self._resolved_user_id == user_id:
+            return
+        with self._temp_writes(), self._conn:
+            self._build_resolved_annotations(self._conn, user_id)
+        self._resolved_user_id = user_id
+
+    def _build_resolved_annotations(
         self,
+        conn: sqlite3.Connection,
         user_id: str,
-        term: str,
-        scope: SearchScope,
-        sort_field: SortField = "artist",
-        sort_desc: bool = False,
-        limit: int = DEFAULT_LIMIT,
-        offset: int = 0,
-    ) -> tuple[list[TrackRow], int]:
-        terms = [part for part in term.strip().split() if part]
-        if not terms:
-            terms = [""]
-
-        scope_fields: list[str]
-        if scope == "artist":
-            scope_fields = [
-                "mf.artist",
-                "mf.order_artist_name",
-                "mf.sort_artist_name",
-            ]
-        elif scope == "album":
-            scope_fields = [
-                "mf.album",
-                "mf.order_album_name",
-                "mf.sort_album_name",
-            ]
-        elif scope == "track":
-            scope_fields = [
-                "mf.title",
-                "mf.order_title",
-                "mf.sort_title",
-            ]
-        else:
-            scope_fields = [
-                "mf.artist",
-                "mf.album",
-                "mf.title",
-                "mf.full_text",
-            ]
-
-        search_clauses: list[str] = []
-        params: list[object] = []
-        for search_term in terms:
-            like = f"%{search_term}%"
-            search_clauses.append(
-                "(" + " OR ".join(f"{field} LIKE ? COLLATE NOCASE" for field in scope_fields) + ")"
+        track_filter: str = "",
+        table: str = "resolved_annotation",
+    ) -> None:
+        """(Re)create temp.<table> on ``conn``, optionally for a subset of item ids."""
+        conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+        conn.execute(
+            f"""
+            CREATE TEMP TABLE {table} (
+                item_id TEXT PRIMARY KEY,
+                item_type TEXT NOT NULL,
+                play_count INTEGER,
+                rating INTEGER,
+                play_date TEXT,
+                rated_at TEXT
             )
-            params.extend([like] * len(scope_fields))
-
-        scope_sql = " AND ".join(search_clauses)
-
-        rating_expr = "COALESCE(NULLIF(ann.rating, 0), CAST(ROUND(mf.average_rating) AS INTEGER), 0)"
-
-        order_map: dict[SortField, str] = {
-            "id": "mf.id",
-            "artist": "mf.order_artist_name",
-            "album": "mf.order_album_name",
-            "title": "COALESCE(NULLIF(mf.sort_title, ''), mf.order_title)",
-            "rating": rating_expr,
-            "play_count": "COALESCE(ann.play_count, 0)",
-        }
-        resolved_sort = order_map.get(sort_field, order_map["artist"])
-        direction = "DESC" if sort_desc else "ASC"
+            """
+        )
+        self._insert_resolved_annotations(conn, user_id, track_filter, table)
 
+    def _insert_resolved_annotations(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        track_filter: str = "",
+        table: str = "resolved_annotation",
+    ) -> None:
         item_type_placeholders = ",".join("?" for _ in TRACK_ITEM_TYPE_CANDIDATES)
-        ann_params: list[object] = [user_id, *TRACK_ITEM_TYPE_CANDIDATES]
-        count_row = self._conn.execute(
-            f"""
-            SELECT COUNT(*) AS total
-            FROM media_file mf
-            WHERE mf.missing = FALSE
-              AND {scope_sql}
-            """,
-            params,
-        ).fetchone()
-        total = int(count_row["total"] if count_row else 0)
-
-        query_params = [*ann_params, *params, limit, offset]
-
-        rows = self._conn.execute(
+        conn.execute(
             f"""
-            WITH ranked_annotation AS (
+            INSERT INTO temp.{table}
+                (item_id, item_type, play_count, rating, play_date, rated_at)
+            SELECT item_id, item_type, play_count, rating, play_date, rated_at
+            FROM (
                 SELECT
                     item_id,
+                    item_type,
                     play_count,
                     rating,
                     play_date,
@@ -264,83 +859,241 @@ class NavidromeRepository:
                 FROM annotation
                 WHERE user_id = ?
                   AND item_type IN ({item_type_placeholders})
+                  {track_filter}
             )
+            WHERE rn = 1
+            """,
+            (user_id, *TRACK_ITEM_TYPE_CANDIDATES),
+        )
+
+    def _refresh_resolved_annotations(self, user_id: str, track_ids: Collection[str]) -> dict[str, sqlite3.Row]:
+        """Re-resolve ``track_ids`` from the live annotation rows; returns the fresh rows by track id."""
+        if self._resolved_user_id != user_id or not track_ids:
+            return {}
+        with self._temp_writes(), self._conn:
+            self._conn.execute("DROP TABLE IF EXISTS temp.refresh_track")
+            self._conn.execute("CREATE TEMP TABLE refresh_track (item_id TEXT PRIMARY KEY)")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO temp.refresh_track (item_id) VALUES (?)",
+                [(track_id,) for track_id in track_ids],
+            )
+            self._conn.execute(
+                "DELETE FROM temp.resolved_annotation WHERE item_id IN (SELECT item_id FROM temp.refresh_track)"
+            )
+            self._insert_resolved_annotations(
+                self._conn, user_id, "AND item_id IN (SELECT item_id FROM temp.refresh_track)"
+            )
+            rows = self._conn.execute(
+                """
+                SELECT ann.item_id, ann.play_count, ann.rating, ann.play_date, ann.rated_at
+                FROM temp.refresh_track t
+                JOIN temp.resolved_annotation ann
+                    ON ann.item_id = t.item_id
+                """
+            ).fetchall()
+            self._conn.execute("DROP TABLE temp.refresh_track")
+        return {row["item_id"]: row for row in rows}
+
+    def search_tracks(
+        self,
+        user_id: str,
+        term: str,
+        scope: SearchScope,
+        sort_field: SortField = "artist",
+        sort_desc: bool = False,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+        after: SeekKey | None = None,
+        include_total: bool = True,
+        count_limit: int | None = None,
+    ) -> SearchResult:
+        scope_sql, params, count_source_sql = self._search_filter(term, scope)
+
+        resolved_sort = SORT_ORDER_MAP.get(sort_field, SORT_ORDER_MAP["artist"])
+        direction = "DESC" if sort_desc else "ASC"
+
+        self._ensure_resolved_annotations(user_id)
+        total: int | None = None
+        candidates = self._search_candidates(term, scope) if self.incremental_search else None
+        if candidates is not None:
+            scope_sql, params = "mf.id IN (SELECT id FROM temp.search_candidates)", []
+            if include_total:
+                total = candidates if count_limit is None else min(candidates, count_limit + 1)
+        elif include_total:
+            total = self._count(count_source_sql, params, count_limit)
+
+        seek_sql = ""
+        seek_params: list[object] = []
+        if after is not None:
+            clause, seek_params = seek_clause(resolved_sort, sort_desc, after)
+            seek_sql = f"AND {clause}"
+        seek_columns = ",\n".join(
+            f"                {expr} AS seek_{index}"
+            for index, expr in enumerate((resolved_sort, *SORT_TIEBREAKERS))
+        )
+
+        # One extra row tells the caller whether another page exists.
+        query_params = [*params, *seek_params, limit + 1, offset]
+
+        rows = self._conn.execute(
+            f"""
             SELECT
                 mf.id,
                 mf.artist,
                 mf.album,
                 mf.title,
-                {rating_expr} AS rating,
-                COALESCE(ann.play_count, 0) AS play_count,
-                ann.play_date,
-                ann.rated_at,
+                CAST(ROUND(mf.average_rating) AS INTEGER) AS average_rating,
                 mf.disc_number,
                 mf.track_number,
                 mf.duration,
                 mf.year,
                 mf.path,
-                mf.album_id
+                mf.album_id,
+{seek_columns}
             FROM media_file mf
-                        LEFT JOIN ranked_annotation ann
-                                ON ann.item_id = mf.id
-                             AND ann.rn = 1
+            LEFT JOIN temp.resolved_annotation ann
+                ON ann.item_id = mf.id
             WHERE mf.missing = FALSE
               AND {scope_sql}
+              {seek_sql}
             ORDER BY {resolved_sort} {direction},
-                     mf.order_artist_name,
-                     mf.order_album_name,
-                     mf.disc_number,
-                     mf.track_number
+                     {", ".join(SORT_TIEBREAKERS)}
             LIMIT ?
             OFFSET ?
             """,
             query_params,
         ).fetchall()
 
-        return ([
-            TrackRow(
-                id=row["id"],
-                artist=row["artist"] or "",
-                album=row["album"] or "",
-                title=row["title"] or "",
-                rating=int(row["rating"] or 0),
-                play_count=int(row["play_count"] or 0),
-                play_date=row["play_date"],
-                rated_at=row["rated_at"],
-                disc_number=int(row["disc_number"] or 0),
-                track_number=int(row["track_number"] or 0),
-                duration=float(row["duration"] or 0),
-                year=int(row["year"] or 0),
-                path=row["path"] or "",
-                album_id=row["album_id"] or "",
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        last_key: SeekKey | None = None
+        if rows:
+            last_row = rows[-1]
+            last_key = tuple(last_row[f"seek_{index}"] for index in range(len(SORT_TIEBREAKERS) + 1))
+
+        # Navidrome may have recorded plays since the session table was built.
+        fresh = self._refresh_resolved_annotations(user_id, [row["id"] for row in rows])
+        track_rows = []
+        user_ratings = []
+        for row in rows:
+            ann = fresh.get(row["id"])
+            user_rating = int(ann["rating"] or 0) if ann else 0
+            user_ratings.append(user_rating)
+            track_rows.append(
+                TrackRow(
+                    id=row["id"],
+                    artist=row["artist"] or "",
+                    album=row["album"] or "",
+                    title=row["title"] or "",
+                    rating=user_rating or int(row["average_rating"] or 0),
+                    play_count=int(ann["play_count"] or 0) if ann else 0,
+                    play_date=ann["play_date"] if ann else None,
+                    rated_at=ann["rated_at"] if ann else None,
+                    disc_number=int(row["disc_number"] or 0),
+                    track_number=int(row["track_number"] or 0),
+                    duration=float(row["duration"] or 0),
+                    year=int(row["year"] or 0),
+                    path=row["path"] or "",
+                    album_id=row["album_id"] or "",
+                )
             )
-            for row in rows
-        ], total)
+        # Cache what get_track would return, which has no average-rating fallback.
+        self.track_cache.put_many(
+            user_id,
+            (replace(track, rating=user_rating) for track, user_rating in zip(track_rows, user_ratings)),
+        )
+        return SearchResult(rows=track_rows, total=total, last_key=last_key, has_more=has_more)
+
+    def count_tracks(self, term: str, scope: SearchScope, count_limit: int | None = None) -> int:
+        """Count matches, stopping after count_limit + 1 rows when a limit is given."""
+        candidates = self._search_candidates(term, scope) if self.incremental_search else None
+        if candidates is not None:
+            return candidates if count_limit is None else min(candidates, count_limit + 1)
+        _, params, count_source_sql = self._search_filter(term, scope)
+        return self._count(count_source_sql, params, count_limit)
+
+    def _search_candidates(self, term: str, scope: SearchScope) -> int | None:
+        """Materialize the LIKE matches for ``term`` in temp.search_candidates."""
+        terms = search_terms(term)
+        if terms == [""] or (self.search_index is not None and self.search_index.can_serve(terms)):
+            return None
+        query = (frozenset(part.translate(NOCASE_FOLD) for part in terms), scope)
+        if query == self._candidate_query:
+            return self._candidate_count
+
+        scope_sql, params, _ = self._search_filter(term, scope)
+        source = "media_file mf"
+        previous = self._candidate_query
+        if previous is not None and previous[1] == scope and refines_search(previous[0], query[0]):
+            source = "temp.search_candidates c JOIN media_file mf ON mf.id = c.id"
+        with self._temp_writes():
+            self._conn.execute("DROP TABLE IF EXISTS temp.search_candidates_next")
+            self._conn.execute("CREATE TEMP TABLE search_candidates_next (id TEXT PRIMARY KEY)")
+            try:
+                with self._conn:
+                    count = self._conn.execute(
+                        f"""
+                        INSERT INTO temp.search_candidates_next (id)
+                        SELECT mf.id
+                        FROM {source}
+                        WHERE mf.missing = FALSE
+                          AND {scope_sql}
+                        """,
+                        params,
+                    ).rowcount
+            except BaseException:
+                self._conn.execute("DROP TABLE IF EXISTS temp.search_candidates_next")
+                raise
+            self._conn.execute("DROP TABLE IF EXISTS temp.search_candidates")
+            self._conn.execute("ALTER TABLE temp.search_candidates_next RENAME TO search_candidates")
+        self._candidate_query = query
+        self._candidate_count = count
+        return count
+
+    def _count(self, source_sql: str, params: list[object], count_limit: int | None) -> int:
+        row = self._conn.execute(
+            f"SELECT COUNT(*) AS total FROM ({source_sql} LIMIT ?)",
+            [*params, -1 if count_limit is None else count_limit + 1],
+        ).fetchone()
+        return int(row["total"] if row else 0)
+
+    def _search_filter(self, term: str, scope: SearchScope) -> tuple[str, list[object], str]:
+        """Return (WHERE fragment on mf, its params, SELECT producing one row per match)."""
+        terms = search_terms(term)
+
+        scope_fields = [f"mf.{field}" for field in SCOPE_FIELDS.get(scope, SCOPE_FIELDS["all"])]
+
+        if self.search_index is not None and self.search_index.can_serve(terms):
+            match = self.search_index.match_expression(terms, scope)
+            scope_sql = "mf.id IN (SELECT id FROM search.track_fts WHERE track_fts MATCH ?)"
+            count_source_sql = "SELECT 1 FROM search.track_fts WHERE track_fts MATCH ?"
+            return (scope_sql, [match], count_source_sql)
+
+        search_clauses: list[str] = []
+        params: list[object] = []
+        for search_term in terms:
+            like = f"%{search_term}%"
+            search_clauses.append(
+                "(" + " OR ".join(f"{field} LIKE ? COLLATE NOCASE" for field in scope_fields) + ")"
+            )
+            params.extend([like] * len(scope_fields))
+
+        scope_sql = " AND ".join(search_clauses)
+        count_source_sql = f"""
+            SELECT 1
+            FROM media_file mf
+            WHERE mf.missing = FALSE
+              AND {scope_sql}
+            """
+        return (scope_sql, params, count_source_sql)
 
     def get_track(self, user_id: str, track_id: str) -> TrackRow | None:
-        item_type_placeholders = ",".join("?" for _ in TRACK_ITEM_TYPE_CANDIDATES)
+        cached = self.track_cache.get(user_id, track_id)
+        if cached is not None:
+            return cached
+        self._ensure_resolved_annotations(user_id)
         row = self._conn.execute(
-            f"""
-            WITH ranked_annotation AS (
-                SELECT
-                    item_id,
-                    play_count,
-                    rating,
-                    play_date,
-                    rated_at,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY item_id
-                        ORDER BY CASE item_type
-                            WHEN 'track' THEN 0
-                            WHEN 'media_file' THEN 1
-                            WHEN 'song' THEN 2
-                            ELSE 100
-                        END
-                    ) AS rn
-                FROM annotation
-                WHERE user_id = ?
-                  AND item_type IN ({item_type_placeholders})
-            )
+            """
             SELECT
                 mf.id,
                 mf.artist,
@@ -357,18 +1110,17 @@ class NavidromeRepository:
                 mf.path,
                 mf.album_id
             FROM media_file mf
-            LEFT JOIN ranked_annotation ann
+            LEFT JOIN temp.resolved_annotation ann
                 ON ann.item_id = mf.id
-               AND ann.rn = 1
             WHERE mf.id = ?
             LIMIT 1
             """,
-            (user_id, *TRACK_ITEM_TYPE_CANDIDATES, track_id),
+            (track_id,),
         ).fetchone()
         if not row:
             return None
 
-        return TrackRow(
+        track = TrackRow(
             id=row["id"],
             artist=row["artist"] or "",
             album=row["album"] or "",
@@ -384,6 +1136,8 @@ class NavidromeRepository:
             path=row["path"] or "",
             album_id=row["album_id"] or "",
         )
+        self.track_cache.put_many(user_id, [track])
+        return track
 
     def transfer_metadata(
         self,
@@ -395,87 +1149,302 @@ class NavidromeRepository:
         if source_track_id == target_track_id:
             raise ValueError("Source and target tracks must be different")
 
-        source_track = self._conn.execute(
-            "SELECT id, album_id FROM media_file WHERE id = ?",
-            (source_track_id,),
-        ).fetchone()
-        target_track = self._conn.execute(
-            "SELECT id, album_id FROM media_file WHERE id = ?",
-            (target_track_id,),
-        ).fetchone()
-        if not source_track or not target_track:
-            raise ValueError("Source or target track does not exist")
-
-        source_ann = self._get_track_annotation(user_id, source_track_id)
-        target_ann = self._get_track_annotation(user_id, target_track_id)
-
-        source_item_type = str(source_ann["item_type"]) if source_ann else self.track_item_type
-        target_item_type = str(target_ann["item_type"]) if target_ann else self.track_item_type
-
-        source_play_count = int(source_ann["play_count"] if source_ann else 0)
-        source_rating = int(source_ann["rating"] if source_ann else 0)
-        source_play_date = parse_dt(source_ann["play_date"] if source_ann else None)
-        source_rated_at = source_ann["rated_at"] if source_ann else None
-
-        target_play_count = int(target_ann["play_count"] if target_ann else 0)
-        target_rating = int(target_ann["rating"] if target_ann else 0)
-        target_play_date = parse_dt(target_ann["play_date"] if target_ann else None)
-        target_rated_at = target_ann["rated_at"] if target_ann else None
-
-        new_source_play_count = source_play_count
-        new_target_play_count = target_play_count
-        new_source_rating = source_rating
-        new_target_rating = target_rating
-        new_source_play_date = source_play_date
-        new_target_play_date = target_play_date
-        new_source_rated_at = source_rated_at
-        new_target_rated_at = target_rated_at
-
-        if mode in ("playcount", "playcount_and_rating"):
-            new_target_play_count = target_play_count + source_play_count
-            new_source_play_count = 0
-            if source_play_date is not None:
-                if target_play_date is None or target_play_date <= source_play_date:
-                    new_target_play_date = source_play_date
-            new_source_play_date = None
-
-        if mode in ("rating", "playcount_and_rating"):
-            new_target_rating = source_rating
-            new_source_rating = 0
-            new_target_rated_at = source_rated_at
-            new_source_rated_at = None
+        with self._writer() as conn:
+            source_track = conn.execute(
+                "SELECT id, album_id FROM media_file WHERE id = ?",
+                (source_track_id,),
+            ).fetchone()
+            target_track = conn.execute(
+                "SELECT id, album_id FROM media_file WHERE id = ?",
+                (target_track_id,),
+            ).fetchone()
+            if not source_track or not target_track:
+                raise ValueError("Source or target track does not exist")
+
+            source_ann = self._to_track_annotation(self._get_track_annotation(conn, user_id, source_track_id))
+            target_ann = self._to_track_annotation(self._get_track_annotation(conn, user_id, target_track_id))
+            new_source, new_target = apply_transfer(source_ann, target_ann, mode)
 
-        with self._conn:
             self._upsert_track_annotation(
+                conn,
                 user_id=user_id,
                 track_id=source_track_id,
-                item_type=source_item_type,
-                play_count=new_source_play_count,
-                rating=new_source_rating,
-                play_date=dt_to_db(new_source_play_date),
-                rated_at=new_source_rated_at,
+                item_type=new_source.item_type,
+                play_count=new_source.play_count,
+                rating=new_source.rating,
+                play_date=dt_to_db(new_source.play_date),
+                rated_at=new_source.rated_at,
             )
             self._upsert_track_annotation(
+                conn,
                 user_id=user_id,
                 track_id=target_track_id,
-                item_type=target_item_type,
-                play_count=new_target_play_count,
-                rating=new_target_rating,
-                play_date=dt_to_db(new_target_play_date),
-                rated_at=new_target_rated_at,
+                item_type=new_target.item_type,
+                play_count=new_target.play_count,
+                rating=new_target.rating,
+                play_date=dt_to_db(new_target.play_date),
+                rated_at=new_target.rated_at,
             )
 
             if mode in ("playcount", "playcount_and_rating"):
                 source_album_id = source_track["album_id"] or ""
                 target_album_id = target_track["album_id"] or ""
                 affected_album_ids = {aid for aid in (source_album_id, target_album_id) if aid}
-                for album_id in affected_album_ids:
-                    self._recompute_album_annotation(user_id=user_id, album_id=album_id)
+                if affected_album_ids:
+                    self._rebuild_album_annotations(conn, user_id, affected_album_ids)
+        self._after_write(user_id, (source_track_id, target_track_id))
+
+    def transfer_metadata_bulk(
+        self,
+        user_id: str,
+        pairs: Sequence[tuple[str, str]],
+        mode: TransferMode,
+    ) -> BulkTransferResult:
+        """Apply many transfers in one transaction."""
+        same = [source_id for source_id, target_id in pairs if source_id == target_id]
+        if same:
+            raise ValueError(f"Source and target tracks must be different: {', '.join(same[:5])}")
+        if not pairs:
+            return BulkTransferResult(pairs=0, tracks=0, albums=0)
+
+        track_ids = list(dict.fromkeys(track_id for pair in pairs for track_id in pair))
+        item_type_placeholders = ",".join("?" for _ in TRACK_ITEM_TYPE_CANDIDATES)
+        with self._writer() as conn:
+            conn.execute("DROP TABLE IF EXISTS temp.transfer_track")
+            conn.execute("CREATE TEMP TABLE transfer_track (track_id TEXT PRIMARY KEY)")
+            try:
+                conn.executemany(
+                    "INSERT INTO temp.transfer_track (track_id) VALUES (?)",
+                    [(track_id,) for track_id in track_ids],
+                )
+                # Ranked from annotation, not the session table.
+                rows = conn.execute(
+                    f"""
+                    SELECT
+                        t.track_id,
+                        mf.id AS found_id,
+                        mf.album_id,
+                        ann.item_type,
+                        ann.play_count,
+                        ann.rating,
+                        ann.play_date,
+                        ann.rated_at
+                    FROM temp.transfer_track t
+                    LEFT JOIN media_file mf
+                        ON mf.id = t.track_id
+                    LEFT JOIN (
+                        SELECT
+                            item_id,
+                            item_type,
+                            play_count,
+                            rating,
+                            play_date,
+                            rated_at,
+                            ROW_NUMBER() OVER (
+                                PARTITION BY item_id
+                                ORDER BY CASE item_type
+                                    WHEN 'track' THEN 0
+                                    WHEN 'media_file' THEN 1
+                                    WHEN 'song' THEN 2
+                                    ELSE 100
+                                END
+                            ) AS rn
+                        FROM annotation
+                        WHERE user_id = ?
+                          AND item_type IN ({item_type_placeholders})
+                          AND item_id IN (SELECT track_id FROM temp.transfer_track)
+                    ) ann
+                        ON ann.item_id = t.track_id
+                       AND ann.rn = 1
+                    """,
+                    (user_id, *TRACK_ITEM_TYPE_CANDIDATES),
+                ).fetchall()
+            finally:
+                conn.execute("DROP TABLE IF EXISTS temp.transfer_track")
+
+            missing = [row["track_id"] for row in rows if row["found_id"] is None]
+            if missing:
+                raise ValueError(f"{len(missing)} track(s) do not exist: {', '.join(missing[:5])}")
+
+            states = {
+                row["track_id"]: self._to_track_annotation(row if row["item_type"] is not None else None)
+                for row in rows
+            }
+            for source_id, target_id in pairs:
+                states[source_id], states[target_id] = apply_transfer(states[source_id], states[target_id], mode)
+
+            affected_album_ids: set[str] = set()
+            if mode in ("playcount", "playcount_and_rating"):
+                affected_album_ids = {row["album_id"] for row in rows if row["album_id"]}
+
+            written = [
+                (
+                    track_id,
+                    state.item_type,
+                    state.play_count,
+                    state.rating,
+                    dt_to_db(state.play_date),
+                    state.rated_at,
+                )
+                for track_id, state in states.items()
+            ]
+            conn.executemany(
+                UPSERT_TRACK_ANNOTATION_SQL,
+                [(user_id, *values) for values in written],
+            )
+            if affected_album_ids:
+                self._rebuild_album_annotations(conn, user_id, affected_album_ids)
+        self._after_write(user_id, states)
+
+        return BulkTransferResult(pairs=len(pairs), tracks=len(states), albums=len(affected_album_ids))
+
+    def find_duplicate_tracks(
+        self,
+        user_id: str,
+        duration_tolerance: float = DUPLICATE_DURATION_TOLERANCE,
+    ) -> list[DuplicateGroup]:
+        """Group tracks with the same normalized artist, album and title."""
+        buckets: dict[tuple[str, str, str], list[tuple[float, str]]] = {}
+        for track_id, artist, album, title, duration in self._conn.execute(
+            """
+            SELECT id, artist, album, title, duration
+            FROM media_file
+            WHERE missing = FALSE
+            """
+        ):
+            normalized_title = normalize_match_text(title or "")
+            if not normalized_title:
+                continue
+            key = (normalize_match_text(artist or ""), normalize_match_text(album or ""), normalized_title)
+            buckets.setdefault(key, []).append((float(duration or 0), track_id))
+
+        clusters = [
+            cluster
+            for entries in buckets.values()
+            if len(entries) > 1
+            for cluster in cluster_by_duration(entries, duration_tolerance)
+        ]
+        if not clusters:
+            return []
+
+        self._ensure_resolved_annotations(user_id)
+        with self._temp_writes():
+            self._conn.execute("DROP TABLE IF EXISTS temp.duplicate_track")
+            self._conn.execute("CREATE TEMP TABLE duplicate_track (track_id TEXT PRIMARY KEY)")
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO temp.duplicate_track (track_id) VALUES (?)",
+                    [(track_id,) for cluster in clusters for track_id in cluster],
+                )
+        try:
+            rows = self._conn.execute(
+                """
+                SELECT
+                    mf.id,
+                    mf.artist,
+                    mf.album,
+                    mf.title,
+                    COALESCE(ann.rating, 0) AS rating,
+                    COALESCE(ann.play_count, 0) AS play_count,
+                    ann.play_date,
+                    ann.rated_at,
+                    mf.disc_number,
+                    mf.track_number,
+                    mf.duration,
+                    mf.year,
+                    mf.path,
+                    mf.album_id
+                FROM temp.duplicate_track d
+                JOIN media_file mf
+                    ON mf.id = d.track_id
+                LEFT JOIN temp.resolved_annotation ann
+                    ON ann.item_id = mf.id
+                """
+            ).fetchall()
+        finally:
+            with self._temp_writes():
+                self._conn.execute("DROP TABLE IF EXISTS temp.duplicate_track")
+
+        tracks = {
+            row["id"]: TrackRow(
+                id=row["id"],
+                artist=row["artist"] or "",
+                album=row["album"] or "",
+                title=row["title"] or "",
+                rating=int(row["rating"] or 0),
+                play_count=int(row["play_count"] or 0),
+                play_date=row["play_date"],
+                rated_at=row["rated_at"],
+                disc_number=int(row["disc_number"] or 0),
+                track_number=int(row["track_number"] or 0),
+                duration=float(row["duration"] or 0),
+                year=int(row["year"] or 0),
+                path=row["path"] or "",
+                album_id=row["album_id"] or "",
+            )
+            for row in rows
+        }
+        self.track_cache.put_many(user_id, tracks.values())
+        groups: list[DuplicateGroup] = []
+        for cluster in clusters:
+            members = sorted((tracks[track_id] for track_id in cluster), key=duplicate_rank)
+            best = members[0]
+            groups.append(DuplicateGroup(artist=best.artist, album=best.album, title=best.title, tracks=members))
+        groups.sort(
+            key=lambda group: (
+                -sum(track.play_count for track in group.tracks),
+                -max(track.rating for track in group.tracks),
+                group.artist.casefold(),
+                group.album.casefold(),
+                group.title.casefold(),
+            )
+        )
+        return groups
+
+    def merge_duplicates(
+        self,
+        user_id: str,
+        keeper_id: str,
+        track_ids: Sequence[str],
+        mode: TransferMode,
+    ) -> None:
+        """Merge the annotations of ``track_ids`` into ``keeper_id``."""
+        sources = [track_id for track_id in dict.fromkeys(track_ids) if track_id != keeper_id]
+        if not sources:
+            return
+        if mode in ("playcount", "playcount_and_rating"):
+            self.transfer_metadata_bulk(user_id, [(source_id, keeper_id) for source_id in sources], "playcount")
+        if mode in ("rating", "playcount_and_rating"):
+            candidates = [
+                track
+                for track in (self.get_track(user_id, track_id) for track_id in [keeper_id, *sources])
+                if track
+            ]
+            best = max(candidates, key=lambda track: (track.rating, track.id == keeper_id))
+            if best.id != keeper_id:
+                self.transfer_metadata(user_id, best.id, keeper_id, "rating")
+
+    def _to_track_annotation(self, row: sqlite3.Row | None) -> TrackAnnotation:
+        if row is None:
+            return TrackAnnotation(
+                item_type=self.track_item_type,
+                play_count=0,
+                rating=0,
+                play_date=None,
+                rated_at=None,
+            )
+        return TrackAnnotation(
+            item_type=str(row["item_type"]),
+            play_count=int(row["play_count"] or 0),
+            rating=int(row["rating"] or 0),
+            play_date=parse_dt(row["play_date"]),
+            rated_at=row["rated_at"],
+        )
 
-    def _get_track_annotation(self, user_id: str, track_id: str) -> sqlite3.Row | None:
+    def _get_track_annotation(self, conn: sqlite3.Connection, user_id: str, track_id: str) -> sqlite3.Row | None:
         placeholders = ",".join("?" for _ in TRACK_ITEM_TYPE_CANDIDATES)
         params: list[object] = [user_id, track_id, *TRACK_ITEM_TYPE_CANDIDATES]
-        return self._conn.execute(
+        return conn.execute(
             f"""
             SELECT item_type, play_count, rating, play_date, rated_at
             FROM annotation
@@ -495,6 +1464,7 @@ class NavidromeRepository:
 
     def _upsert_track_annotation(
         self,
+        conn: sqlite3.Connection,
         user_id: str,
         track_id: str,
         item_type: str,
@@ -503,67 +1473,392 @@ class NavidromeRepository:
         play_date: str | None,
         rated_at: str | None,
     ) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO annotation (user_id, item_id, item_type, play_count, rating, play_date, rated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(user_id, item_id, item_type) DO UPDATE SET
-                play_count = excluded.play_count,
-                rating = excluded.rating,
-                play_date = excluded.play_date,
-                rated_at = excluded.rated_at
-            """,
+        conn.execute(
+            UPSERT_TRACK_ANNOTATION_SQL,
             (user_id, track_id, item_type, play_count, rating, play_date, rated_at),
         )
 
-    def _recompute_album_annotation(self, user_id: str, album_id: str) -> None:
-        item_type_placeholders = ",".join("?" for _ in TRACK_ITEM_TYPE_CANDIDATES)
-        aggregate = self._conn.execute(
-            f"""
-            WITH ranked_annotation AS (
-                SELECT
-                    item_id,
-                    play_count,
-                    play_date,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY item_id
-                        ORDER BY CASE item_type
-                            WHEN 'track' THEN 0
-                            WHEN 'media_file' THEN 1
-                            WHEN 'song' THEN 2
-                            ELSE 100
-                        END
-                    ) AS rn
-                FROM annotation
-                WHERE user_id = ?
-                  AND item_type IN ({item_type_placeholders})
+    def _after_write(self, user_id: str, track_ids: Collection[str]) -> None:
+        """Bring session state up to date once a write has committed."""
+        self._refresh_resolved_annotations(user_id, track_ids)
+        self.track_cache.invalidate(user_id, track_ids)
+
+    def rebuild_album_annotations(self, user_id: str, album_ids: Collection[str] | None = None) -> int:
+        """Recompute album play counts and last-played dates in one pass."""
+        with self._writer() as conn:
+            return self._rebuild_album_annotations(conn, user_id, album_ids)
+
+    def _rebuild_album_annotations(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        album_ids: Collection[str] | None,
+    ) -> int:
+        album_filter = ""
+        if album_ids is not None:
+            conn.execute("DROP TABLE IF EXISTS temp.rebuild_album")
+            conn.execute("CREATE TEMP TABLE rebuild_album (album_id TEXT PRIMARY KEY)")
+            conn.executemany(
+                "INSERT OR IGNORE INTO temp.rebuild_album (album_id) VALUES (?)",
+                [(album_id,) for album_id in album_ids],
             )
-            SELECT
-                COALESCE(SUM(COALESCE(ann.play_count, 0)), 0) AS album_play_count,
-                MAX(ann.play_date) AS album_last_played
-            FROM media_file mf
-            LEFT JOIN ranked_annotation ann
-                ON ann.item_id = mf.id
-               AND ann.rn = 1
-            WHERE mf.album_id = ?
-              AND mf.missing = FALSE
-            """,
-            (user_id, *TRACK_ITEM_TYPE_CANDIDATES, album_id),
-        ).fetchone()
+            album_filter = "AND mf.album_id IN (SELECT album_id FROM temp.rebuild_album)"
+        # Resolved from live annotation rows, not the session table.
+        track_filter = ""
+        if album_ids is not None:
+            track_filter = f"AND item_id IN (SELECT mf.id FROM media_file mf WHERE TRUE {album_filter})"
+        self._build_resolved_annotations(conn, user_id, track_filter, table="album_track_annotation")
+        try:
+            # Missing tracks still group so albums that lost every track are reset.
+            cursor = conn.execute(
+                f"""
+                INSERT INTO annotation (user_id, item_id, item_type, play_count, play_date)
+                SELECT ?, agg.album_id, 'album', agg.play_count, agg.last_played
+                FROM (
+                    SELECT
+                        mf.album_id,
+                        COALESCE(SUM(CASE WHEN mf.missing = FALSE THEN ann.play_count END), 0) AS play_count,
+                        MAX(CASE WHEN mf.missing = FALSE THEN ann.play_date END) AS last_played
+                    FROM media_file mf
+                    LEFT JOIN temp.album_track_annotation ann
+                        ON ann.item_id = mf.id
+                    WHERE mf.album_id IS NOT NULL
+                      AND mf.album_id != ''
+                      {album_filter}
+                    GROUP BY mf.album_id
+                ) agg
+                LEFT JOIN annotation existing
+                    ON existing.user_id = ?
+                   AND existing.item_id = agg.album_id
+                   AND existing.item_type = 'album'
+                WHERE agg.play_count > 0
+                   OR existing.item_id IS NOT NULL
+                ON CONFLICT(user_id, item_id, item_type) DO UPDATE SET
+                    play_count = excluded.play_count,
+                    play_date = excluded.play_date
+                """,
+                (user_id, user_id),
+            )
+            return cursor.rowcount
+        finally:
+            conn.execute("DROP TABLE IF EXISTS temp.album_track_annotation")
+            if album_ids is not None:
+                conn.execute("DROP TABLE IF EXISTS temp.rebuild_album")
+
+
+QueryCallback = Callable[[int, Any, BaseException | None], None]
+
+
+@dataclass(slots=True)
+class QueryJob:
+    channel: str
+    generation: int
+    run: Callable[[NavidromeRepository], Any]
+    callback: QueryCallback | None
+    cancellable: bool
+
+
+class QueryWorker:
+    """Runs repository calls on one background thread with its own connection."""
+
+    def __init__(
+        self,
+        repo_factory: Callable[[], NavidromeRepository],
+        dispatch: Callable[..., Any],
+    ) -> None:
+        self._repo_factory = repo_factory
+        self._dispatch = dispatch
+        self._jobs: queue.SimpleQueue[QueryJob | None] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+        self._running: QueryJob | None = None
+        self._repo: NavidromeRepository | None = None
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="query-worker", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        channel: str,
+        run: Callable[[NavidromeRepository], Any],
+        callback: QueryCallback | None = None,
+        cancellable: bool = True,
+    ) -> int:
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            running = self._running
+            if (
+                cancellable
+                and running is not None
+                and running.cancellable
+                and running.channel == channel
+                and self._repo is not None
+            ):
+                self._repo.interrupt()
+        self._jobs.put(QueryJob(channel, generation, run, callback, cancellable))
+        return generation
+
+    def cancel(self, channel: str) -> None:
+        """Drop queued jobs on a channel and interrupt its running job, if any."""
+        self.submit(channel, lambda repo: None)
+
+    def is_current(self, channel: str, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(channel) == generation
+
+    def close(self) -> None:
+        with self._lock:
+            self._closing = True
+            if self._running is not None and self._running.cancellable and self._repo is not None:
+                self._repo.interrupt()
+        self._jobs.put(None)
+        self._thread.join(timeout=2)
+
+    def _run(self) -> None:
+        repo = self._repo_factory()
+        with self._lock:
+            self._repo = repo
+        try:
+            while (job := self._jobs.get()) is not None:
+                with self._lock:
+                    if job.cancellable and self._generations.get(job.channel) != job.generation:
+                        continue
+                    self._running = job
+                result: Any = None
+                error: BaseException | None = None
+                try:
+                    result = job.run(repo)
+                except Exception as exc:
+                    error = exc
+                finally:
+                    with self._lock:
+                        self._running = None
+                if job.callback is None or self._closing:
+                    continue
+                if job.cancellable and not self.is_current(job.channel, job.generation):
+                    continue
+                try:
+                    self._dispatch(job.callback, job.generation, result, error)
+                except Exception:
+                    # The app stopped or the callback failed; keep serving later jobs.
+                    pass
+        finally:
+            repo.close()
+
+
+@dataclass(slots=True)
+class TrackColumns:
+    """Column-wise store of the fields a results table shows."""
+
+    ids: list[str]
+    artists: list[str]
+    albums: list[str]
+    titles: list[str]
+    ratings: array[int]
+    play_counts: array[int]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[TrackRow]) -> TrackColumns:
+        return cls(
+            ids=[row.id for row in rows],
+            artists=[row.artist for row in rows],
+            albums=[row.album for row in rows],
+            titles=[row.title for row in rows],
+            ratings=array("q", (row.rating for row in rows)),
+            play_counts=array("q", (row.play_count for row in rows)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def cells(self, index: int) -> tuple[str, ...]:
+        """Raw cell values for one row, in COLUMN_DEFS order."""
+        return (
+            self.ids[index],
+            self.artists[index],
+            self.albums[index],
+            self.titles[index],
+            str(self.ratings[index]),
+            str(self.play_counts[index]),
+        )
+
+
+class TrackTable(ScrollView, can_focus=True):
+    """Results table that only formats the rows in view."""
+
+    COMPONENT_CLASSES = {
+        "track-table--header",
+        "track-table--cursor",
+        "track-table--even-row",
+    }
+
+    DEFAULT_CSS = """
+    TrackTable {
+        background: $surface;
+        color: $foreground;
+
+        & > .track-table--header {
+            text-style: bold;
+            background: $panel;
+        }
+
+        & > .track-table--even-row {
+            background: $surface-lighten-1 50%;
+        }
+
+        & > .track-table--cursor {
+            background: $block-cursor-blurred-background;
+            color: $block-cursor-blurred-foreground;
+        }
+
+        &:focus > .track-table--cursor {
+            background: $block-cursor-background;
+            color: $block-cursor-foreground;
+            text-style: $block-cursor-text-style;
+        }
+    }
+    """
 
-        play_count = int(aggregate["album_play_count"] or 0)
-        last_played = aggregate["album_last_played"]
+    BINDINGS = [
+        Binding("up", "cursor_up", show=False),
+        Binding("down", "cursor_down", show=False),
+        Binding("pageup", "cursor_page_up", show=False),
+        Binding("pagedown", "cursor_page_down", show=False),
+        Binding("home", "cursor_first", show=False),
+        Binding("end", "cursor_last", show=False),
+        Binding("enter", "select_cursor", show=False),
+    ]
 
-        self._conn.execute(
-            """
-            INSERT INTO annotation (user_id, item_id, item_type, play_count, play_date)
-            VALUES (?, ?, 'album', ?, ?)
-            ON CONFLICT(user_id, item_id, item_type) DO UPDATE SET
-                play_count = excluded.play_count,
-                play_date = excluded.play_date
-            """,
-            (user_id, album_id, play_count, last_played),
+    class RowHighlighted(Message):
+        def __init__(self, track_table: TrackTable, track_id: str) -> None:
+            self.track_table = track_table
+            self.track_id = track_id
+            super().__init__()
+
+        @property
+        def control(self) -> TrackTable:
+            return self.track_table
+
+    class RowSelected(Message):
+        def __init__(self, track_table: TrackTable, track_id: str) -> None:
+            self.track_table = track_table
+            self.track_id = track_id
+            super().__init__()
+
+        @property
+        def control(self) -> TrackTable:
+            return self.track_table
+
+    class HeaderSelected(Message):
+        def __init__(self, track_table: TrackTable, column_key: str) -> None:
+            self.track_table = track_table
+            self.column_key = column_key
+            super().__init__()
+
+        @property
+        def control(self) -> TrackTable:
+            return self.track_table
+
+    def __init__(self, *, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self.columns = TrackColumns.from_rows([])
+        self.cursor_row = 0
+        # Each cell is padded by one space on both sides, like DataTable.
+        self._row_width = sum(width + 2 for _, _, width in COLUMN_DEFS)
+
+    def set_rows(self, rows: Sequence[TrackRow]) -> None:
+        self.columns = TrackColumns.from_rows(rows)
+        self.cursor_row = 0
+        # Line 0 is the header, so the content is one line taller than the rows.
+        self.virtual_size = Size(self._row_width, len(self.columns) + 1)
+        self.scroll_to(0, 0, animate=False)
+        self.refresh()
+
+    @property
+    def _visible_rows(self) -> int:
+        return max(1, self.scrollable_content_region.height - 1)
+
+    def _render_cells(self, values: Sequence[str], style: Style) -> Strip:
+        text = "".join(
+            f" {set_cell_size(truncate_for_column(value, width), width)} "
+            for value, (_, _, width) in zip(values, COLUMN_DEFS)
         )
+        return Strip([Segment(text, style)], self._row_width)
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        base_style = self.rich_style
+        if y == 0:
+            style = base_style + self.get_component_rich_style("track-table--header")
+            strip = self._render_cells([label for _, label, _ in COLUMN_DEFS], style)
+            return strip.crop_extend(scroll_x, scroll_x + width, style)
+
+        row = scroll_y + y - 1
+        if row >= len(self.columns):
+            return Strip.blank(width, base_style)
+        if row == self.cursor_row:
+            style = base_style + self.get_component_rich_style("track-table--cursor")
+        elif row % 2:
+            style = base_style + self.get_component_rich_style("track-table--even-row")
+        else:
+            style = base_style
+        return self._render_cells(self.columns.cells(row), style).crop_extend(scroll_x, scroll_x + width, style)
+
+    def move_cursor(self, row: int) -> None:
+        if not len(self.columns):
+            return
+        row = max(0, min(row, len(self.columns) - 1))
+        if row == self.cursor_row:
+            return
+        self.cursor_row = row
+        if row < self.scroll_y:
+            self.scroll_to(y=row, animate=False)
+        elif row >= self.scroll_y + self._visible_rows:
+            self.scroll_to(y=row - self._visible_rows + 1, animate=False)
+        self.refresh()
+        self.post_message(self.RowHighlighted(self, self.columns.ids[row]))
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(self.cursor_row - 1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(self.cursor_row + 1)
+
+    def action_cursor_page_up(self) -> None:
+        self.move_cursor(self.cursor_row - self._visible_rows)
+
+    def action_cursor_page_down(self) -> None:
+        self.move_cursor(self.cursor_row + self._visible_rows)
+
+    def action_cursor_first(self) -> None:
+        self.move_cursor(0)
+
+    def action_cursor_last(self) -> None:
+        self.move_cursor(len(self.columns) - 1)
+
+    def action_select_cursor(self) -> None:
+        if self.cursor_row < len(self.columns):
+            self.post_message(self.RowSelected(self, self.columns.ids[self.cursor_row]))
+
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        if offset.y == 0:
+            x = offset.x + self.scroll_x
+            for key, _, width in COLUMN_DEFS:
+                if x < width + 2:
+                    self.post_message(self.HeaderSelected(self, key))
+                    return
+                x -= width + 2
+            return
+
+        row = self.scroll_y + offset.y - 1
+        if row < len(self.columns):
+            self.move_cursor(row)
+            self.action_select_cursor()
 
 
 class UserSelectScreen(ModalScreen[str | None]):
@@ -739,12 +2034,12 @@ class TargetPickerScreen(ModalScreen[str | None]):
 
     def __init__(
         self,
-        repo: NavidromeRepository,
+        queries: QueryWorker,
         user_id: str,
         source_track: TrackRow,
     ) -> None:
         super().__init__()
-        self.repo = repo
+        self.queries = queries
         self.user_id = user_id
         self.source_track = source_track
         self.search_scope: SearchScope = "all"
@@ -777,19 +2072,37 @@ class TargetPickerScreen(ModalScreen[str | None]):
         self._refresh_tracks()
 
     def _refresh_tracks(self) -> None:
-        table = self.query_one("#target-table", DataTable)
+        user_id = self.user_id
         search_term = self.query_one("#target-search", Input).value
-        rows, _ = self.repo.search_tracks(
-            self.user_id,
-            search_term,
-            self.search_scope,
-            limit=DEFAULT_LIMIT,
-            offset=0,
+        scope = self.search_scope
+        self.queries.submit(
+            "target",
+            lambda repo: repo.search_tracks(
+                user_id,
+                search_term,
+                scope,
+                limit=DEFAULT_LIMIT,
+                offset=0,
+                include_total=False,
+            ),
+            self._apply_tracks,
         )
+
+    def _apply_tracks(
+        self,
+        generation: int,
+        result: SearchResult | None,
+        error: BaseException | None,
+    ) -> None:
+        if not self.is_attached or not self.queries.is_current("target", generation):
+            return
+        if error is not None or result is None:
+            return
+        table = self.query_one("#target-table", DataTable)
         table.clear()
         self.selected_track_id = None
 
-        for row in rows:
+        for row in result.rows:
             if row.id == self.source_track.id:
                 continue
             table.add_row(
@@ -846,6 +2159,133 @@ class TargetPickerScreen(ModalScreen[str | None]):
         self.dismiss(None)
 
 
+class DuplicatesScreen(ModalScreen[tuple[DuplicateGroup, str] | None]):
+    CSS = """
+    DuplicatesScreen {
+        align: center middle;
+    }
+
+    #duplicates-modal {
+        width: 96%;
+        height: 90%;
+        border: tall $accent;
+        background: $surface;
+        padding: 1;
+        layout: vertical;
+    }
+
+    #duplicates-status {
+        height: auto;
+        margin-top: 1;
+        margin-bottom: 1;
+    }
+
+    #duplicates-table {
+        height: 1fr;
+    }
+
+    #duplicates-actions {
+        height: auto;
+        align-horizontal: right;
+        margin-top: 1;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+        Binding("enter", "merge", "Merge Into Selected"),
+    ]
+
+    def __init__(self, queries: QueryWorker, user_id: str) -> None:
+        super().__init__()
+        self.queries = queries
+        self.user_id = user_id
+        self.groups_by_track: dict[str, DuplicateGroup] = {}
+        self.selected_track_id: str | None = None
+
+    def compose(self) -> ComposeResult:
+        with Container(id="duplicates-modal"):
+            yield Static("Subscreen: Duplicate tracks (select the track to keep)")
+            yield Static("Scanning for duplicates...", id="duplicates-status")
+            yield DataTable(id="duplicates-table")
+            with Container(id="duplicates-actions"):
+                yield Button("Cancel", id="duplicates-cancel")
+                yield Button("Merge into selected", id="duplicates-merge", variant="primary")
+
+    def on_mount(self) -> None:
+        table = self.query_one("#duplicates-table", DataTable)
+        table.cursor_type = "row"
+        table.add_column("Group", width=6)
+        for _, label, width in COLUMN_DEFS:
+            table.add_column(label, width=width)
+        table.add_column("Duration", width=9)
+        user_id = self.user_id
+        self.queries.submit(
+            "duplicates",
+            lambda repo: repo.find_duplicate_tracks(user_id),
+            self._apply_groups,
+        )
+
+    def _apply_groups(
+        self,
+        generation: int,
+        groups: list[DuplicateGroup] | None,
+        error: BaseException | None,
+    ) -> None:
+        if not self.is_attached or not self.queries.is_current("duplicates", generation):
+            return
+        status = self.query_one("#duplicates-status", Static)
+        if error is not None or groups is None:
+            status.update(f"Duplicate scan failed: {error}")
+            return
+
+        table = self.query_one("#duplicates-table", DataTable)
+        table.clear()
+        self.groups_by_track = {}
+        for group_number, group in enumerate(groups, start=1):
+            for row in group.tracks:
+                self.groups_by_track[row.id] = group
+                table.add_row(
+                    str(group_number),
+                    truncate_for_column(row.id, COLUMN_DEFS[0][2]),
+                    truncate_for_column(row.artist, COLUMN_DEFS[1][2]),
+                    truncate_for_column(row.album, COLUMN_DEFS[2][2]),
+                    truncate_for_column(row.title, COLUMN_DEFS[3][2]),
+                    truncate_for_column(str(row.rating), COLUMN_DEFS[4][2]),
+                    truncate_for_column(str(row.play_count), COLUMN_DEFS[5][2]),
+                    f"{row.duration:.1f}s",
+                    key=row.id,
+                )
+        track_count = len(self.groups_by_track)
+        status.update(f"{len(groups):,} duplicate group(s), {track_count:,} track(s)")
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        if event.data_table.id != "duplicates-table":
+            return
+        self.selected_track_id = str(event.row_key.value)
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if event.data_table.id != "duplicates-table":
+            return
+        self.selected_track_id = str(event.row_key.value)
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "duplicates-merge":
+            self.action_merge()
+        else:
+            self.action_cancel()
+
+    def action_merge(self) -> None:
+        group = self.groups_by_track.get(self.selected_track_id or "")
+        if group is None or self.selected_track_id is None:
+            return
+        self.dismiss((group, self.selected_track_id))
+
+    def action_cancel(self) -> None:
+        self.queries.cancel("duplicates")
+        self.dismiss(None)
+
+
 class NavidromeMetadataApp(App[None]):
     TITLE = "Navidrome Metadata TUI"
 
@@ -914,23 +2354,46 @@ class NavidromeMetadataApp(App[None]):
         Binding("ctrl+m", "open_transfer_menu", "Actions"),
         Binding("n", "next_page", "Next Page"),
         Binding("p", "prev_page", "Prev Page"),
+        Binding("r", "reload", "Reload"),
+        Binding("d", "find_duplicates", "Duplicates"),
         Binding("q", "quit", "Quit"),
     ]
 
-    def __init__(self, repo: NavidromeRepository, user_hint: str | None) -> None:
+    def __init__(
+        self,
+        repo: NavidromeRepository,
+        user_hint: str | None,
+        count_mode: CountMode = "exact",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        virtual_table: bool = False,
+    ) -> None:
         super().__init__()
         self.repo = repo
         self.user_hint = user_hint
+        self.count_mode = count_mode
+        self.virtual_table = virtual_table
         self.user_id: str | None = None
         self.user_name: str | None = None
         self.search_scope: SearchScope = "all"
         self.sort_field: SortField = "artist"
         self.sort_desc = False
         self.page_index = 0
-        self.page_size = DEFAULT_PAGE_SIZE
-        self.total_results = 0
+        # _page_keys[i] is the seek key page i starts after (None for page 0).
+        self._page_keys: list[SeekKey | None] = [None]
+        self.page_size = page_size
+        self.total_results: int | None = None
+        self._has_more = False
+        # (term, scope) that total_results was counted for, and one being counted.
+        self._counted_query: tuple[str, SearchScope] | None = None
+        self._counting_query: tuple[str, SearchScope] | None = None
         self.selected_track_id: str | None = None
         self._search_timer: Timer | None = None
+        self.queries: QueryWorker | None = None
+        # Pages of the current query, including neighbours fetched ahead of n/p.
+        self._page_cache = PageCache()
+        # Prefetch channel -> page it is fetching, and the page waiting on one.
+        self._prefetching: dict[str, PageKey] = {}
+        self._awaited_page: tuple[PageKey, tuple[str, SearchScope], str | None] | None = None
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -948,17 +2411,22 @@ class NavidromeMetadataApp(App[None]):
                     yield RadioButton("album", id="scope-album")
                     yield RadioButton("track", id="scope-track")
             with Container(id="results-pane"):
-                yield DataTable(id="results-table")
+                if self.virtual_table:
+                    yield TrackTable(id="results-table")
+                else:
+                    yield DataTable(id="results-table")
             yield Static("Ready", id="status")
         yield Footer()
 
     def on_mount(self) -> None:
         self.repo.validate_schema()
-        table = self.query_one("#results-table", DataTable)
-        table.cursor_type = "row"
-        for key, label, width in COLUMN_DEFS:
-            table.add_column(label, key=key, width=width)
+        if not self.virtual_table:
+            table = self.query_one("#results-table", DataTable)
+            table.cursor_type = "row"
+            for key, label, width in COLUMN_DEFS:
+                table.add_column(label, key=key, width=width)
 
+        self.queries = QueryWorker(self.repo.clone, self.call_from_thread)
         self._update_layout_visibility()
         self._pick_user_then_load()
 
@@ -966,6 +2434,8 @@ class NavidromeMetadataApp(App[None]):
         self._update_layout_visibility(width=event.size.width, height=event.size.height)
 
     def on_unmount(self) -> None:
+        if self.queries is not None:
+            self.queries.close()
         self.repo.close()
 
     def _update_layout_visibility(self, width: int | None = None, height: int | None = None) -> None:
@@ -1020,7 +2490,7 @@ class NavidromeMetadataApp(App[None]):
 
     def on_input_changed(self, event: Input.Changed) -> None:
         if event.input.id == "search-input":
-            self.page_index = 0
+            self._reset_paging()
             self._schedule_refresh()
 
     def on_radio_set_changed(self, event: RadioSet.Changed) -> None:
@@ -1033,68 +2503,245 @@ class NavidromeMetadataApp(App[None]):
             self.search_scope = "track"
         else:
             self.search_scope = "all"
-        self.page_index = 0
+        self._reset_paging()
         self._refresh_tracks()
 
-    def _refresh_tracks(self) -> None:
-        if not self.user_id:
+    def _reset_paging(self) -> None:
+        self.page_index = 0
+        self._page_keys = [None]
+        self._drop_prefetched()
+
+    def _drop_prefetched(self) -> None:
+        """Forget cached pages, e.g. when the query changes or data was written."""
+        self._page_cache.clear()
+        self._prefetching.clear()
+        if self.queries is not None:
+            for channel in PREFETCH_CHANNELS:
+                self.queries.cancel(channel)
+
+    def _page_key(self, after: SeekKey | None) -> PageKey:
+        return (
+            self.user_id or "",
+            self.query_one("#search-input", Input).value,
+            self.search_scope,
+            self.sort_field,
+            self.sort_desc,
+            self.page_size,
+            after,
+        )
+
+    def _refresh_tracks(self, note: str | None = None) -> None:
+        if not self.user_id or self.queries is None:
             return
 
+        user_id = self.user_id
         search_term = self.query_one("#search-input", Input).value
-        offset = self.page_index * self.page_size
-        rows, total = self.repo.search_tracks(
-            self.user_id,
-            search_term,
-            self.search_scope,
-            sort_field=self.sort_field,
-            sort_desc=self.sort_desc,
-            limit=self.page_size,
-            offset=offset,
+        scope = self.search_scope
+        sort_field = self.sort_field
+        sort_desc = self.sort_desc
+        page_size = self.page_size
+        after = self._page_keys[self.page_index]
+        query_key = (search_term, scope)
+        if query_key != self._counting_query:
+            self._counting_query = None
+            self.queries.cancel("count")
+        page_key = self._page_key(after)
+        self._awaited_page = None
+        cached = self._page_cache.get(page_key)
+        if cached is not None:
+            self.queries.cancel("results")
+            self._show_tracks(cached, query_key, note)
+            return
+        # Keep a prefetch already fetching this page and cancel the rest.
+        for channel, key in list(self._prefetching.items()):
+            if key != page_key:
+                self._prefetching.pop(channel, None)
+                self.queries.cancel(channel)
+        if page_key in self._prefetching.values():
+            self.queries.cancel("results")
+            self._awaited_page = (page_key, query_key, note)
+            return
+        # Totals only depend on (term, scope), so paging never recounts.
+        include_total = query_key != self._counted_query and self.count_mode != "lazy"
+        count_limit = COUNT_CAP if self.count_mode == "capped" else None
+        self.queries.submit(
+            "results",
+            lambda repo: repo.search_tracks(
+                user_id,
+                search_term,
+                scope,
+                sort_field=sort_field,
+                sort_desc=sort_desc,
+                limit=page_size,
+                after=after,
+                include_total=include_total,
+                count_limit=count_limit,
+            ),
+            partial(self._apply_tracks, page_key=page_key, query_key=query_key, note=note),
         )
 
-        max_page_index = max(0, (total - 1) // self.page_size) if total else 0
-        if self.page_index > max_page_index:
-            self.page_index = max_page_index
-            offset = self.page_index * self.page_size
-            rows, total = self.repo.search_tracks(
-                self.user_id,
-                search_term,
-                self.search_scope,
-                sort_field=self.sort_field,
-                sort_desc=self.sort_desc,
-                limit=self.page_size,
-                offset=offset,
+    def _prefetch_neighbours(self) -> None:
+        """Fetch the pages either side of the current one while the user reads."""
+        if not self.user_id or self.queries is None:
+            return
+        neighbours: list[tuple[str, SeekKey | None]] = []
+        if self._has_more and len(self._page_keys) > self.page_index + 1:
+            neighbours.append(("prefetch-next", self._page_keys[self.page_index + 1]))
+        if self.page_index > 0:
+            neighbours.append(("prefetch-prev", self._page_keys[self.page_index - 1]))
+        for channel, after in neighbours:
+            page_key = self._page_key(after)
+            if page_key in self._page_cache or self._prefetching.get(channel) == page_key:
+                continue
+            self._prefetching[channel] = page_key
+            user_id, term, scope, sort_field, sort_desc, page_size, _ = page_key
+            self.queries.submit(
+                channel,
+                partial(
+                    NavidromeRepository.search_tracks,
+                    user_id=user_id,
+                    term=term,
+                    scope=scope,
+                    sort_field=sort_field,
+                    sort_desc=sort_desc,
+                    limit=page_size,
+                    after=after,
+                    include_total=False,
+                ),
+                partial(self._apply_prefetched, channel=channel, page_key=page_key),
             )
 
+    def _apply_prefetched(
+        self,
+        generation: int,
+        page: SearchResult | None,
+        error: BaseException | None,
+        channel: str,
+        page_key: PageKey,
+    ) -> None:
+        if self.queries is None or not self.queries.is_current(channel, generation):
+            return
+        self._prefetching.pop(channel, None)
+        if error is None and page is not None:
+            self._page_cache.put(page_key, page)
+        if self._awaited_page is None or self._awaited_page[0] != page_key:
+            return
+        _, query_key, note = self._awaited_page
+        self._awaited_page = None
+        if error is not None or page is None:
+            self._refresh_tracks(note=note)
+        else:
+            self._show_tracks(page, query_key, note)
+
+    def _count_tracks(self, query_key: tuple[str, SearchScope]) -> None:
+        if self.queries is None or query_key == self._counting_query:
+            return
+        search_term, scope = query_key
+        self._counting_query = query_key
+        self.queries.submit(
+            "count",
+            lambda repo: repo.count_tracks(search_term, scope),
+            partial(self._apply_count, query_key=query_key),
+        )
+
+    def _apply_count(
+        self,
+        generation: int,
+        total: int | None,
+        error: BaseException | None,
+        query_key: tuple[str, SearchScope],
+    ) -> None:
+        if self.queries is None or not self.queries.is_current("count", generation):
+            return
+        self._counting_query = None
+        if error is not None or total is None:
+            return
         self.total_results = total
-        table = self.query_one("#results-table", DataTable)
-        table.clear()
+        self._counted_query = query_key
+        self._set_status(self._status_line())
+
+    def _status_line(self) -> str:
+        current_page = self.page_index + 1
+        if self.total_results is None:
+            results = "counting..."
+            pages = str(current_page)
+        elif self.count_mode == "capped" and self.total_results > COUNT_CAP:
+            results = f"{COUNT_CAP:,}+"
+            pages = str(current_page)
+        else:
+            total_pages = max(1, (self.total_results + self.page_size - 1) // self.page_size)
+            results = str(self.total_results)
+            pages = f"{current_page}/{total_pages}"
+        return (
+            f"User: {self.user_name} | Results: {results} | Page: {pages} | Scope: {self.search_scope} | Sort: {self.sort_field} {'desc' if self.sort_desc else 'asc'}"
+        )
 
-        for row in rows:
-            table.add_row(
-                truncate_for_column(row.id, COLUMN_DEFS[0][2]),
-                truncate_for_column(row.artist, COLUMN_DEFS[1][2]),
-                truncate_for_column(row.album, COLUMN_DEFS[2][2]),
-                truncate_for_column(row.title, COLUMN_DEFS[3][2]),
-                truncate_for_column(str(row.rating), COLUMN_DEFS[4][2]),
-                truncate_for_column(str(row.play_count), COLUMN_DEFS[5][2]),
-                key=row.id,
-            )
+    def _apply_tracks(
+        self,
+        generation: int,
+        result: SearchResult | None,
+        error: BaseException | None,
+        page_key: PageKey,
+        query_key: tuple[str, SearchScope],
+        note: str | None = None,
+    ) -> None:
+        if self.queries is None or not self.queries.is_current("results", generation):
+            return
+        if error is not None or result is None:
+            self._set_status(f"Search failed: {error}")
+            return
+        self._page_cache.put(page_key, result)
+        self._show_tracks(result, query_key, note)
+
+    def _show_tracks(
+        self,
+        result: SearchResult,
+        query_key: tuple[str, SearchScope],
+        note: str | None = None,
+    ) -> None:
+        if not result.rows and self.page_index > 0:
+            # The page emptied underneath us (e.g. after a transfer); start over.
+            self._reset_paging()
+            self._refresh_tracks(note=note)
+            return
+
+        del self._page_keys[self.page_index + 1 :]
+        self._page_keys.append(result.last_key)
+        rows = result.rows
+        self._has_more = result.has_more
+        if result.total is not None:
+            self.total_results = result.total
+            self._counted_query = query_key
+        elif query_key != self._counted_query:
+            self.total_results = None
+            self._count_tracks(query_key)
+        if self.virtual_table:
+            self.query_one("#results-table", TrackTable).set_rows(rows)
+        else:
+            table = self.query_one("#results-table", DataTable)
+            table.clear()
+
+            for row in rows:
+                table.add_row(
+                    truncate_for_column(row.id, COLUMN_DEFS[0][2]),
+                    truncate_for_column(row.artist, COLUMN_DEFS[1][2]),
+                    truncate_for_column(row.album, COLUMN_DEFS[2][2]),
+                    truncate_for_column(row.title, COLUMN_DEFS[3][2]),
+                    truncate_for_column(str(row.rating), COLUMN_DEFS[4][2]),
+                    truncate_for_column(str(row.play_count), COLUMN_DEFS[5][2]),
+                    key=row.id,
+                )
 
         if rows:
             self.selected_track_id = rows[0].id
             self._show_track_details(rows[0])
-            total_pages = max(1, (total + self.page_size - 1) // self.page_size)
-            current_page = self.page_index + 1
-            self._set_status(
-                f"User: {self.user_name} | Results: {total} | Page: {current_page}/{total_pages} | Scope: {self.search_scope} | Sort: {self.sort_field} {'desc' if self.sort_desc else 'asc'}"
-            )
         else:
             self.selected_track_id = None
             self.query_one("#detail-pane", Static).update("No results")
-            self._set_status(
-                f"User: {self.user_name} | Results: 0 | Page: 1/1 | Scope: {self.search_scope} | Sort: {self.sort_field} {'desc' if self.sort_desc else 'asc'}"
-            )
+        self._set_status(self._status_line())
+        if note:
+            self._set_status(note)
+        self._prefetch_neighbours()
 
     def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
         if event.data_table.id != "results-table":
@@ -1110,6 +2757,13 @@ class NavidromeMetadataApp(App[None]):
                 return
             clicked_key = COLUMN_DEFS[column_index][0]
 
+        self._toggle_sort(clicked_key)
+
+    def on_track_table_header_selected(self, event: TrackTable.HeaderSelected) -> None:
+        if event.track_table.id == "results-table":
+            self._toggle_sort(event.column_key)
+
+    def _toggle_sort(self, clicked_key: str) -> None:
         valid_fields = {key for key, _, _ in COLUMN_DEFS}
         if clicked_key not in valid_fields:
             return
@@ -1121,14 +2775,14 @@ class NavidromeMetadataApp(App[None]):
             self.sort_field = next_field
             self.sort_desc = False
 
-        self.page_index = 0
+        self._reset_paging()
         self._refresh_tracks()
 
     def action_next_page(self) -> None:
-        if self.total_results <= 0:
+        if not self._has_more:
             return
-        max_page_index = max(0, (self.total_results - 1) // self.page_size)
-        if self.page_index >= max_page_index:
+        if len(self._page_keys) <= self.page_index + 1:
+            # The current page is still loading, so the next page's key is unknown.
             return
         self.page_index += 1
         self._refresh_tracks()
@@ -1139,6 +2793,13 @@ class NavidromeMetadataApp(App[None]):
         self.page_index -= 1
         self._refresh_tracks()
 
+    def action_reload(self) -> None:
+        if self.queries is None:
+            return
+        self.queries.submit("write", lambda repo: repo.reload_annotations(), cancellable=False)
+        self._drop_prefetched()
+        self._refresh_tracks()
+
     def _show_track_details(self, track: TrackRow) -> None:
         detail = (
             f"ID: {track.id}\n"
@@ -1162,9 +2823,7 @@ class NavidromeMetadataApp(App[None]):
 
         selected_id = str(event.row_key.value)
         self.selected_track_id = selected_id
-        track = self.repo.get_track(self.user_id, selected_id)
-        if track:
-            self._show_track_details(track)
+        self._load_track_details(selected_id)
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         if event.data_table.id != "results-table" or not self.user_id:
@@ -1172,7 +2831,45 @@ class NavidromeMetadataApp(App[None]):
 
         selected_id = str(event.row_key.value)
         self.selected_track_id = selected_id
-        track = self.repo.get_track(self.user_id, selected_id)
+        self._load_track_details(selected_id)
+
+    def on_track_table_row_highlighted(self, event: TrackTable.RowHighlighted) -> None:
+        if event.track_table.id != "results-table" or not self.user_id:
+            return
+
+        self.selected_track_id = event.track_id
+        self._load_track_details(event.track_id)
+
+    def on_track_table_row_selected(self, event: TrackTable.RowSelected) -> None:
+        if event.track_table.id != "results-table" or not self.user_id:
+            return
+
+        self.selected_track_id = event.track_id
+        self._load_track_details(event.track_id)
+
+    def _load_track_details(self, track_id: str) -> None:
+        if not self.user_id or self.queries is None:
+            return
+        user_id = self.user_id
+        cached = self.repo.track_cache.get(user_id, track_id)
+        if cached is not None:
+            self.queries.cancel("detail")
+            self._show_track_details(cached)
+            return
+        self.queries.submit(
+            "detail",
+            lambda repo: repo.get_track(user_id, track_id),
+            self._apply_track_details,
+        )
+
+    def _apply_track_details(
+        self,
+        generation: int,
+        track: TrackRow | None,
+        error: BaseException | None,
+    ) -> None:
+        if self.queries is None or not self.queries.is_current("detail", generation):
+            return
         if track:
             self._show_track_details(track)
 
@@ -1181,13 +2878,34 @@ class NavidromeMetadataApp(App[None]):
             self.action_open_transfer_menu()
 
     def action_open_transfer_menu(self) -> None:
-        if not self.user_id:
+        if not self.user_id or self.queries is None:
             return
         if not self.selected_track_id:
             self._set_status("No source track selected")
             return
 
-        source_track = self.repo.get_track(self.user_id, self.selected_track_id)
+        user_id = self.user_id
+        source_id = self.selected_track_id
+        cached = self.repo.track_cache.get(user_id, source_id)
+        if cached is not None:
+            self.queries.cancel("source")
+            self._after_source_loaded(0, cached, None)
+            return
+        self.queries.submit(
+            "source",
+            lambda repo: repo.get_track(user_id, source_id),
+            self._after_source_loaded,
+        )
+
+    def _after_source_loaded(
+        self,
+        generation: int,
+        source_track: TrackRow | None,
+        error: BaseException | None,
+    ) -> None:
+        if error is not None:
+            self._set_status(f"Could not load source track: {error}")
+            return
         if not source_track:
             self._set_status("Source track no longer exists")
             return
@@ -1206,7 +2924,7 @@ class NavidromeMetadataApp(App[None]):
             return
 
         self.push_screen(
-            TargetPickerScreen(self.repo, self.user_id or "", source_track),
+            TargetPickerScreen(self.queries, self.user_id or "", source_track),
             lambda target_id: self._execute_transfer(mode, source_track.id, target_id),
         )
 
@@ -1219,34 +2937,375 @@ class NavidromeMetadataApp(App[None]):
         if not target_track_id:
             self._set_status("Transfer cancelled")
             return
+        if self.queries is None:
+            return
 
-        try:
-            self.repo.transfer_metadata(
-                user_id=self.user_id or "",
+        user_id = self.user_id or ""
+        self.queries.submit(
+            "write",
+            lambda repo: repo.transfer_metadata(
+                user_id=user_id,
                 source_track_id=source_track_id,
                 target_track_id=target_track_id,
                 mode=mode,
-            )
-        except Exception as exc:
-            self._set_status(f"Transfer failed: {exc}")
+            ),
+            lambda _generation, _result, error: self._after_transfer(mode, source_track_id, error),
+            cancellable=False,
+        )
+
+    def _after_transfer(
+        self,
+        mode: TransferMode,
+        source_track_id: str,
+        error: BaseException | None,
+    ) -> None:
+        if error is not None:
+            self._set_status(f"Transfer failed: {error}")
             return
 
-        self._refresh_tracks()
-        refreshed_source = self.repo.get_track(self.user_id or "", source_track_id)
-        if refreshed_source:
-            self._show_track_details(refreshed_source)
-        self._set_status(f"Transfer complete: {mode}")
+        self._drop_prefetched()
+        self._refresh_tracks(note=f"Transfer complete: {mode}")
+        self._load_track_details(source_track_id)
+
+    def action_find_duplicates(self) -> None:
+        if not self.user_id or self.queries is None:
+            return
+        self.push_screen(DuplicatesScreen(self.queries, self.user_id), self._after_duplicate_selected)
 
+    def _after_duplicate_selected(self, choice: tuple[DuplicateGroup, str] | None) -> None:
+        if choice is None:
+            return
+        group, keeper_id = choice
+        self.push_screen(
+            TransferActionScreen(),
+            lambda mode: self._execute_merge(mode, group, keeper_id),
+        )
+
+    def _execute_merge(
+        self,
+        mode: TransferMode | None,
+        group: DuplicateGroup,
+        keeper_id: str,
+    ) -> None:
+        if mode is None or self.queries is None:
+            return
+
+        user_id = self.user_id or ""
+        track_ids = [track.id for track in group.tracks]
+        merged = len(track_ids) - 1
+        self.queries.submit(
+            "write",
+            lambda repo: repo.merge_duplicates(user_id, keeper_id, track_ids, mode),
+            lambda _generation, _result, error: self._after_merge(mode, keeper_id, merged, error),
+            cancellable=False,
+        )
+
+    def _after_merge(
+        self,
+        mode: TransferMode,
+        keeper_id: str,
+        merged: int,
+        error: BaseException | None,
+    ) -> None:
+        if error is not None:
+            self._set_status(f"Merge failed: {error}")
+            return
 
-@click.command()
+        self.selected_track_id = keeper_id
+        self._drop_prefetched()
+        self._refresh_tracks(note=f"Merged {merged} duplicate(s): {mode}")
+        self._load_track_details(keeper_id)
+
+
+class DefaultCommandGroup(click.Group):
+    """Group that runs ``default_command`` when no command name is given."""
+
+    def __init__(self, *args: Any, default_command: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if not args or (args[0] not in self.commands and args[0] not in ctx.help_option_names):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultCommandGroup, default_command="tui")
+def cli() -> None:
+    """Browse and clean Navidrome metadata via TUI."""
+
+
+@cli.command("tui")
 @click.argument("db_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
 @click.option("--user", "user_hint", default=None, help="User ID or username")
-def cli(db_path: Path, user_hint: str | None) -> None:
+@click.option(
+    "--search-index",
+    "use_search_index",
+    is_flag=True,
+    help="Serve searches from an FTS5 sidecar (<db>.search.db), building it if stale",
+)
+@click.option(
+    "--count-mode",
+    type=click.Choice(["exact", "lazy", "capped"]),
+    default="exact",
+    show_default=True,
+    help=f"exact: count with every search; lazy: show the page first and count in the background; capped: stop counting at {COUNT_CAP:,}",
+)
+@click.option(
+    "--page-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PAGE_SIZE,
+    show_default=True,
+    help="Tracks per results page",
+)
+@click.option(
+    "--virtual-table",
+    is_flag=True,
+    help="Render only the visible rows of each page; use with large --page-size values",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Append time, row count and query plan of every query to this JSONL file",
+)
+@click.option(
+    "--snapshot",
+    is_flag=True,
+    help="Read through a read-only connection and write through short-lived ones; safe while Navidrome runs",
+)
+@click.option(
+    "--incremental-search",
+    is_flag=True,
+    help="Narrow a lengthened search term within the previous matches instead of rescanning",
+)
+def tui(
+    db_path: Path,
+    user_hint: str | None,
+    use_search_index: bool,
+    count_mode: CountMode,
+    page_size: int,
+    virtual_table: bool,
+    profile_path: Path | None,
+    snapshot: bool,
+    incremental_search: bool,
+) -> None:
     """Browse and clean Navidrome metadata via TUI."""
-    repo = NavidromeRepository(db_path)
-    app = NavidromeMetadataApp(repo=repo, user_hint=user_hint)
+    profile_log = profile_path.open("a", encoding="utf-8") if profile_path else None
+    try:
+        run_tui(
+            db_path,
+            user_hint,
+            use_search_index,
+            count_mode,
+            page_size,
+            virtual_table,
+            profile_log,
+            snapshot,
+            incremental_search,
+        )
+    finally:
+        if profile_log is not None:
+            profile_log.close()
+
+
+def run_tui(
+    db_path: Path,
+    user_hint: str | None,
+    use_search_index: bool,
+    count_mode: CountMode,
+    page_size: int,
+    virtual_table: bool,
+    profile_log: TextIO | None,
+    snapshot: bool = False,
+    incremental_search: bool = False,
+) -> None:
+    profiler = QueryProfiler(profile_log) if profile_log is not None else None
+    repo = NavidromeRepository(
+        db_path,
+        profiler=profiler,
+        snapshot=snapshot,
+        incremental_search=incremental_search,
+    )
+    if use_search_index:
+        index_path = default_search_index_path(db_path)
+        click.echo(f"Checking search index {index_path}...")
+        try:
+            if repo.enable_search_index(SearchIndex(index_path)):
+                click.echo("Search index rebuilt")
+        except sqlite3.OperationalError as exc:
+            raise click.ClickException(f"Search index unavailable: {exc}") from exc
+    app = NavidromeMetadataApp(
+        repo=repo,
+        user_hint=user_hint,
+        count_mode=count_mode,
+        page_size=page_size,
+        virtual_table=virtual_table,
+    )
     app.run()
 
 
+def resolve_cli_user(repo: NavidromeRepository, user_hint: str) -> tuple[str, str]:
+    resolved = repo.resolve_user(user_hint)
+    if not resolved:
+        raise click.ClickException(f"User '{user_hint}' not found in database")
+    return resolved
+
+
+@cli.command("bulk-transfer")
+@click.argument("db_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("pairs_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--user", "user_hint", required=True, help="User ID or username")
+@click.option(
+    "--mode",
+    type=click.Choice(["playcount", "rating", "playcount_and_rating"]),
+    default="playcount_and_rating",
+    show_default=True,
+)
+def bulk_transfer(db_path: Path, pairs_path: Path, user_hint: str, mode: TransferMode) -> None:
+    """Transfer metadata for every source_id,target_id pair in a CSV or JSON file."""
+    try:
+        pairs = load_transfer_pairs(pairs_path)
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as exc:
+        raise click.ClickException(f"Could not read pairs from {pairs_path}: {exc}") from exc
+
+    repo = NavidromeRepository(db_path)
+    try:
+        user_id, user_name = resolve_cli_user(repo, user_hint)
+        try:
+            result = repo.transfer_metadata_bulk(user_id, pairs, mode)
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+    finally:
+        repo.close()
+    click.echo(
+        f"{user_name}: transferred {mode} for {result.pairs} pair(s) "
+        f"across {result.tracks} track(s); recomputed {result.albums} album(s)"
+    )
+
+
+@cli.command("find-duplicates")
+@click.argument("db_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--user", "user_hint", required=True, help="User ID or username")
+@click.option(
+    "--tolerance",
+    type=float,
+    default=DUPLICATE_DURATION_TOLERANCE,
+    show_default=True,
+    help="Maximum duration difference in seconds between neighbouring duplicates",
+)
+@click.option(
+    "--output",
+    type=click.File("w", encoding="utf-8"),
+    default="-",
+    help="Where to write source_id,target_id pairs (default: stdout)",
+)
+def find_duplicates(db_path: Path, user_hint: str, tolerance: float, output: Any) -> None:
+    """Write duplicate tracks as pairs for bulk-transfer, the most played one as target."""
+    repo = NavidromeRepository(db_path)
+    try:
+        user_id, user_name = resolve_cli_user(repo, user_hint)
+        groups = repo.find_duplicate_tracks(user_id, duration_tolerance=tolerance)
+    finally:
+        repo.close()
+
+    writer = csv.writer(output)
+    writer.writerow(["source_id", "target_id"])
+    for group in groups:
+        keeper = group.tracks[0]
+        for track in group.tracks[1:]:
+            writer.writerow([track.id, keeper.id])
+    track_count = sum(len(group.tracks) for group in groups)
+    click.echo(f"{user_name}: {len(groups)} duplicate group(s), {track_count} track(s)", err=True)
+
+
+@cli.command("rebuild-albums")
+@click.argument("db_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--user", "user_hint", required=True, help="User ID or username")
+def rebuild_albums(db_path: Path, user_hint: str) -> None:
+    """Recompute every album's play count and last played date from its tracks."""
+    repo = NavidromeRepository(db_path)
+    try:
+        user_id, user_name = resolve_cli_user(repo, user_hint)
+        written = repo.rebuild_album_annotations(user_id)
+    finally:
+        repo.close()
+    click.echo(f"{user_name}: rebuilt {written} album annotation(s)")
+
+
+@cli.command("advise")
+@click.argument("db_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--user", "user_hint", default=None, help="User ID or username (default: first user)")
+@click.option(
+    "--sidecar",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Copy the database here, create the suggested sort indexes in the copy and re-measure",
+)
+def advise(db_path: Path, user_hint: str | None, sidecar: Path | None) -> None:
+    """Suggest sort indexes for the search sort orders."""
+    if sidecar is not None and sidecar.resolve() == db_path.resolve():
+        raise click.ClickException("The sidecar must be a different file from the database")
+
+    repo = NavidromeRepository(db_path, profiler=QueryProfiler())
+    try:
+        if user_hint:
+            user_id, _ = resolve_cli_user(repo, user_hint)
+        else:
+            users = repo.list_users()
+            if not users:
+                raise click.ClickException("No users found in database")
+            user_id = users[0][0]
+        before = profile_sort_orders(repo, user_id)
+    finally:
+        repo.close()
+
+    statements: list[str] = []
+    for (sort_field, sort_desc), record in before.items():
+        label = f"{sort_field} {'desc' if sort_desc else 'asc'}"
+        plan = record["plan"] or []
+        temp_sort = any("USE TEMP B-TREE FOR ORDER BY" in line for line in plan)
+        click.echo(f"{label}: {record['seconds']:.3f}s, {'sorts in a temp B-tree' if temp_sort else 'ordered by an index'}")
+        if not temp_sort:
+            continue
+        statement = sort_index_statement(sort_field, sort_desc)
+        if statement is None:
+            click.echo("  sort key comes from annotations; no media_file index can serve it")
+            continue
+        statements.append(statement)
+        click.echo(f"  suggest: {statement}")
+
+    if not statements:
+        return
+    # Without statistics the planner also picks the partial indexes for unrelated sorts.
+    statements.append("ANALYZE")
+    click.echo("Then run ANALYZE so other queries keep their plans.")
+    if sidecar is None:
+        return
+
+    source = sqlite3.connect(str(db_path))
+    target = sqlite3.connect(str(sidecar))
+    try:
+        source.backup(target)
+        with target:
+            for statement in statements:
+                target.execute(statement)
+    finally:
+        source.close()
+        target.close()
+    click.echo(f"Created {len(statements) - 1} sort index(es) in {sidecar}")
+
+    sidecar_repo = NavidromeRepository(sidecar, profiler=QueryProfiler())
+    try:
+        after = profile_sort_orders(sidecar_repo, user_id)
+    finally:
+        sidecar_repo.close()
+    for key, record in after.items():
+        sort_field, sort_desc = key
+        label = f"{sort_field} {'desc' if sort_desc else 'asc'}"
+        click.echo(f"{label}: {before[key]['seconds']:.3f}s -> {record['seconds']:.3f}s")
+
+
 if __name__ == "__main__":
     cli()
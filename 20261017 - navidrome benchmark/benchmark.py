@@ -0,0 +1,349 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.12"
+# dependencies = [
+#   "click",
+#   "textual",
+#   "requests",
+#   "mutagen",
+#   "musicbrainzngs",
+# ]
+# ///
+"""Time the database work of the Navidrome tools in this repo against a navidrome.db.
+
+Usage:
+    ./generate_db.py bench.db
+    ./benchmark.py bench.db --output baseline.json
+    ./benchmark.py bench.db --baseline baseline.json
+
+With --baseline, cases whose median got slower than the threshold are flagged
+and the exit code is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TOOL_PATHS = {
+    "metadata_tui": REPO_ROOT / "20260707 - navidrome metadata tui" / "main.py",
+    "albums_without_art": REPO_ROOT / "20260625 - find navidrome albums without artwork" / "main.py",
+    "update_years": REPO_ROOT / "20260224 - albums missing year" / "update_years.py",
+}
+DEFAULT_TERM = "love"
+# Differences below this are timer noise, whatever the percentage.
+NOISE_FLOOR_SECONDS = 0.002
+
+
+@dataclass(slots=True)
+class CaseResult:
+    name: str
+    median: float
+    minimum: float
+    maximum: float
+    rows: int | None
+
+
+@cache
+def load_tool(name: str) -> ModuleType:
+    path = TOOL_PATHS[name]
+    spec = importlib.util.spec_from_file_location(f"benchmark_{name}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    # Dataclasses resolve their module through sys.modules while the class is built.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_case(name: str, run: Callable[[int], int | None], repeat: int) -> CaseResult:
+    """Call ``run(iteration)`` once to warm up, then ``repeat`` timed times."""
+    run(0)
+    timings: list[float] = []
+    rows: int | None = None
+    for iteration in range(1, repeat + 1):
+        started = time.perf_counter()
+        rows = run(iteration)
+        timings.append(time.perf_counter() - started)
+    return CaseResult(
+        name=name,
+        median=statistics.median(timings),
+        minimum=min(timings),
+        maximum=max(timings),
+        rows=rows,
+    )
+
+
+def copy_database(source: Path, target: Path) -> None:
+    source_conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    target_conn = sqlite3.connect(str(target))
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        source_conn.close()
+        target_conn.close()
+
+
+def first_user_id(db_path: Path) -> str:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT id FROM user ORDER BY user_name LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        raise ValueError(f"{db_path} has no users")
+    return str(row[0])
+
+
+def search_cases(
+    db_path: Path,
+    user_id: str,
+    term: str,
+    repeat: int,
+    selected: Callable[[str], bool],
+) -> list[CaseResult]:
+    tui = load_tool("metadata_tui")
+    repo = tui.NavidromeRepository(db_path)
+    results: list[CaseResult] = []
+    try:
+        for sort_field in tui.SORT_ORDER_MAP:
+            name = f"search_tracks[browse,{sort_field}]"
+            if selected(name):
+                results.append(
+                    time_case(
+                        name,
+                        lambda _, sort_field=sort_field: len(
+                            repo.search_tracks(user_id, "", "all", sort_field=sort_field).rows
+                        ),
+                        repeat,
+                    )
+                )
+        for scope in tui.SCOPE_FIELDS:
+            for sort_field in tui.SORT_ORDER_MAP:
+                name = f"search_tracks[{scope},{sort_field}]"
+                if selected(name):
+                    results.append(
+                        time_case(
+                            name,
+                            lambda _, scope=scope, sort_field=sort_field: len(
+                                repo.search_tracks(user_id, term, scope, sort_field=sort_field).rows
+                            ),
+                            repeat,
+                        )
+                    )
+        name = "search_tracks[all,artist,page2]"
+        if selected(name):
+            first_page = repo.search_tracks(user_id, term, "all", include_total=False)
+            results.append(
+                time_case(
+                    name,
+                    lambda _: len(
+                        repo.search_tracks(user_id, term, "all", after=first_page.last_key, include_total=False).rows
+                    ),
+                    repeat,
+                )
+            )
+    finally:
+        repo.close()
+    return results
+
+
+def transfer_cases(
+    db_path: Path,
+    user_id: str,
+    transfers: int,
+    repeat: int,
+    selected: Callable[[str], bool],
+) -> list[CaseResult]:
+    names = ("transfer_metadata", "transfer_metadata_bulk")
+    if not any(selected(name) for name in names):
+        return []
+    tui = load_tool("metadata_tui")
+    results: list[CaseResult] = []
+    with tempfile.TemporaryDirectory(prefix="navidrome-bench-") as scratch_dir:
+        scratch = Path(scratch_dir) / "navidrome.db"
+        copy_database(db_path, scratch)
+        conn = sqlite3.connect(str(scratch))
+        try:
+            track_ids = [row[0] for row in conn.execute("SELECT id FROM media_file WHERE missing = FALSE")]
+        finally:
+            conn.close()
+        repo = tui.NavidromeRepository(scratch)
+        try:
+            rng = random.Random(1)
+            # Fresh pairs for every iteration, so no run transfers already-emptied tracks.
+            batches = [
+                [tuple(rng.sample(track_ids, 2)) for _ in range(transfers)]
+                for _ in range(repeat + 1)
+            ]
+
+            def run_single(iteration: int) -> int:
+                for source_id, target_id in batches[iteration]:
+                    repo.transfer_metadata(user_id, source_id, target_id, "playcount_and_rating")
+                return transfers
+
+            def run_bulk(iteration: int) -> int:
+                repo.transfer_metadata_bulk(user_id, batches[iteration], "playcount_and_rating")
+                return transfers
+
+            if selected("transfer_metadata"):
+                results.append(time_case("transfer_metadata", run_single, repeat))
+            if selected("transfer_metadata_bulk"):
+                results.append(time_case("transfer_metadata_bulk", run_bulk, repeat))
+        finally:
+            repo.close()
+    return results
+
+
+def album_cases(db_path: Path, repeat: int, selected: Callable[[str], bool]) -> list[CaseResult]:
+    results: list[CaseResult] = []
+    if selected("query_albums_without_art"):
+        art = load_tool("albums_without_art")
+        results.append(
+            time_case("query_albums_without_art", lambda _: len(art.query_albums_without_art(str(db_path))), repeat)
+        )
+    if selected("query_albums_without_art[cached]"):
+        art = load_tool("albums_without_art")
+        with tempfile.TemporaryDirectory(prefix="navidrome-bench-") as scratch_dir:
+            # The warm-up run fills the cache; timed runs measure unchanged repeat launches.
+            cache_path = str(Path(scratch_dir) / "art-cache.json")
+            results.append(
+                time_case(
+                    "query_albums_without_art[cached]",
+                    lambda _: len(art.query_albums_without_art(str(db_path), cache_path)),
+                    repeat,
+                )
+            )
+    for with_plays in (False, True):
+        name = f"find_problem_albums[{'with_plays_or_ratings' if with_plays else 'all'}]"
+        if not selected(name):
+            continue
+        years = load_tool("update_years")
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            results.append(
+                time_case(
+                    name,
+                    lambda _, with_plays=with_plays: len(years.find_problem_albums(conn, with_plays)),
+                    repeat,
+                )
+            )
+        finally:
+            conn.close()
+    return results
+
+
+def database_summary(db_path: Path) -> dict[str, int]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("user", "folder", "album", "media_file", "annotation")
+        }
+    finally:
+        conn.close()
+
+
+def print_results(results: list[CaseResult], baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """Print a results table and return the names of regressed cases."""
+    regressions: list[str] = []
+    width = max(len(result.name) for result in results)
+    header = f"{'case':<{width}}  {'median ms':>10}  {'min ms':>9}  {'max ms':>9}  {'rows':>7}"
+    if baseline:
+        header += f"  {'baseline':>9}  {'change':>8}"
+    print(header)
+    for result in results:
+        rows = "" if result.rows is None else str(result.rows)
+        line = (
+            f"{result.name:<{width}}  {result.median * 1000:>10.2f}  {result.minimum * 1000:>9.2f}"
+            f"  {result.maximum * 1000:>9.2f}  {rows:>7}"
+        )
+        previous = baseline.get(result.name)
+        if previous:
+            before = previous["median"]
+            change = (result.median - before) / before if before else 0.0
+            line += f"  {before * 1000:>9.2f}  {change:>+8.1%}"
+            if change > threshold and result.median - before > NOISE_FLOOR_SECONDS:
+                regressions.append(result.name)
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", type=Path, help="navidrome.db to benchmark (only read; transfers run on a copy)")
+    parser.add_argument("--user", default=None, help="User ID for annotation-dependent cases (default: first user)")
+    parser.add_argument("--term", default=DEFAULT_TERM, help="Search term for the search_tracks cases")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case, after one warm-up run")
+    parser.add_argument("--transfers", type=int, default=50, help="Transfers per transfer_metadata run")
+    parser.add_argument("--only", action="append", default=[], help="Only run cases containing this text (repeatable)")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON here")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier --output file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown reported as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.db.is_file():
+        print(f"error: database not found: {args.db}", file=sys.stderr)
+        return 2
+    if args.repeat < 1:
+        print("error: --repeat must be at least 1", file=sys.stderr)
+        return 2
+
+    def selected(name: str) -> bool:
+        return not args.only or any(text in name for text in args.only)
+
+    baseline: dict[str, dict[str, float]] = {}
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["cases"]
+
+    user_id = args.user or first_user_id(args.db)
+    results = [
+        *search_cases(args.db, user_id, args.term, args.repeat, selected),
+        *transfer_cases(args.db, user_id, args.transfers, args.repeat, selected),
+        *album_cases(args.db, args.repeat, selected),
+    ]
+    if not results:
+        print("No cases selected", file=sys.stderr)
+        return 2
+    regressions = print_results(results, baseline, args.threshold)
+
+    if args.output is not None:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "database": str(args.db),
+            "tables": database_summary(args.db),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "repeat": args.repeat,
+            "cases": {result.name: asdict(result) for result in results},
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,440 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.12"
+# dependencies = []
+# ///
+"""Generate a synthetic navidrome.db for benchmarking the Navidrome tools in this repo.
+
+Only the tables and columns those tools read are created. Data is skewed the
+way real libraries are: a few artists own most albums, a few albums get most
+plays, and most tracks are never played or rated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+WORDS = (
+    "love night blue river stone fire dream road heart light shadow gold silver rain sun moon "
+    "electric velvet glass iron paper ghost winter summer city ocean desert mountain echo "
+    "silence thunder whisper crystal neon midnight morning evening garden forest island "
+    "machine signal radio mirror golden broken wild lonely distant frozen burning hidden "
+    "sacred secret lost found last first little big black white red green yellow purple "
+    "café señor naïve über fjörd déjà"
+).split()
+ARTICLES = ("The ", "A ", "")
+RATING_WEIGHTS = {1: 5, 2: 10, 3: 30, 4: 35, 5: 20}
+SCHEMA = """
+CREATE TABLE user (
+    id VARCHAR(255) PRIMARY KEY,
+    user_name VARCHAR(255) NOT NULL UNIQUE,
+    name VARCHAR(255) NOT NULL DEFAULT '',
+    email VARCHAR(255) NOT NULL DEFAULT '',
+    is_admin BOOL NOT NULL DEFAULT FALSE,
+    created_at DATETIME,
+    updated_at DATETIME
+);
+CREATE TABLE library (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL UNIQUE,
+    path VARCHAR NOT NULL UNIQUE
+);
+CREATE TABLE folder (
+    id VARCHAR NOT NULL PRIMARY KEY,
+    library_id INTEGER NOT NULL REFERENCES library (id) ON DELETE CASCADE,
+    path VARCHAR DEFAULT '' NOT NULL,
+    name VARCHAR DEFAULT '' NOT NULL,
+    missing BOOLEAN DEFAULT FALSE NOT NULL,
+    parent_id VARCHAR DEFAULT '' NOT NULL,
+    num_audio_files INTEGER DEFAULT 0 NOT NULL,
+    image_files JSONB DEFAULT '[]' NOT NULL,
+    images_updated_at DATETIME,
+    updated_at DATETIME,
+    created_at DATETIME
+);
+CREATE INDEX folder_parent_id ON folder (parent_id);
+CREATE TABLE album (
+    id VARCHAR(255) NOT NULL PRIMARY KEY,
+    name VARCHAR(255) DEFAULT '' NOT NULL,
+    album_artist VARCHAR(255) DEFAULT '' NOT NULL,
+    date VARCHAR(255),
+    min_year INTEGER DEFAULT 0 NOT NULL,
+    max_year INTEGER DEFAULT 0 NOT NULL,
+    song_count INTEGER DEFAULT 0 NOT NULL,
+    duration REAL DEFAULT 0 NOT NULL,
+    order_album_name VARCHAR DEFAULT '' NOT NULL,
+    order_album_artist_name VARCHAR DEFAULT '' NOT NULL,
+    missing BOOLEAN DEFAULT FALSE NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME
+);
+CREATE INDEX album_name ON album (name);
+CREATE TABLE media_file (
+    id VARCHAR(255) NOT NULL PRIMARY KEY,
+    library_id INTEGER DEFAULT 1 NOT NULL,
+    folder_id VARCHAR DEFAULT '' NOT NULL,
+    path VARCHAR(255) DEFAULT '' NOT NULL,
+    title VARCHAR(255) DEFAULT '' NOT NULL,
+    album VARCHAR(255) DEFAULT '' NOT NULL,
+    artist VARCHAR(255) DEFAULT '' NOT NULL,
+    album_artist VARCHAR(255) DEFAULT '' NOT NULL,
+    album_id VARCHAR(255) DEFAULT '' NOT NULL,
+    track_number INTEGER DEFAULT 0 NOT NULL,
+    disc_number INTEGER DEFAULT 0 NOT NULL,
+    year INTEGER DEFAULT 0 NOT NULL,
+    duration REAL DEFAULT 0 NOT NULL,
+    full_text VARCHAR(255) DEFAULT '',
+    order_title VARCHAR DEFAULT '' NOT NULL,
+    order_album_name VARCHAR DEFAULT '' NOT NULL,
+    order_artist_name VARCHAR DEFAULT '' NOT NULL,
+    sort_title VARCHAR(255) DEFAULT '' NOT NULL,
+    sort_album_name VARCHAR(255) DEFAULT '' NOT NULL,
+    sort_artist_name VARCHAR(255) DEFAULT '' NOT NULL,
+    average_rating REAL DEFAULT 0 NOT NULL,
+    missing BOOLEAN DEFAULT FALSE NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME
+);
+CREATE INDEX media_file_album_id ON media_file (album_id);
+CREATE INDEX media_file_folder_id ON media_file (folder_id);
+CREATE INDEX media_file_path ON media_file (path);
+CREATE INDEX media_file_title ON media_file (title);
+CREATE INDEX media_file_missing ON media_file (missing);
+CREATE TABLE annotation (
+    user_id VARCHAR(255) DEFAULT '' NOT NULL REFERENCES user (id) ON DELETE CASCADE,
+    item_id VARCHAR(255) DEFAULT '' NOT NULL,
+    item_type VARCHAR(255) DEFAULT '' NOT NULL,
+    play_count INTEGER DEFAULT 0,
+    play_date DATETIME,
+    rating INTEGER DEFAULT 0,
+    starred BOOL DEFAULT FALSE NOT NULL,
+    starred_at DATETIME,
+    rated_at DATETIME,
+    UNIQUE (user_id, item_id, item_type)
+);
+CREATE INDEX annotation_play_count ON annotation (play_count);
+CREATE INDEX annotation_rating ON annotation (rating);
+"""
+
+
+@dataclass(slots=True)
+class GeneratorConfig:
+    users: int = 3
+    artists: int = 2_000
+    albums: int = 20_000
+    tracks: int = 250_000
+    extra_folders: int = 2_000
+    annotated_ratio: float = 0.4
+    rated_ratio: float = 0.3
+    legacy_annotation_ratio: float = 0.05
+    missing_art_ratio: float = 0.15
+    bad_date_ratio: float = 0.1
+    missing_ratio: float = 0.01
+    duplicate_ratio: float = 0.01
+    seed: int = 1
+
+
+@dataclass(slots=True)
+class GeneratedCounts:
+    users: int
+    folders: int
+    albums: int
+    tracks: int
+    annotations: int
+
+
+def sort_name(value: str) -> str:
+    """Lowercased name without a leading article, like Navidrome's order_* columns."""
+    lowered = value.lower()
+    for article in ("the ", "a "):
+        if lowered.startswith(article):
+            return lowered[len(article) :]
+    return lowered
+
+
+def make_id(rng: random.Random) -> str:
+    return f"{rng.getrandbits(128):032x}"[:22]
+
+
+def make_name(rng: random.Random, words: int, article: bool = False) -> str:
+    name = " ".join(rng.choice(WORDS).title() for _ in range(words))
+    return (rng.choice(ARTICLES) if article else "") + name
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def album_sizes(rng: random.Random, albums: int, tracks: int) -> list[int]:
+    """Split ``tracks`` over ``albums`` with a log-normal spread, at least one each."""
+    raw = [rng.lognormvariate(0, 0.5) for _ in range(albums)]
+    scale = tracks / sum(raw)
+    sizes = [max(1, round(value * scale)) for value in raw]
+    difference = tracks - sum(sizes)
+    while difference:
+        index = rng.randrange(albums)
+        if difference > 0:
+            sizes[index] += 1
+            difference -= 1
+        elif sizes[index] > 1:
+            sizes[index] -= 1
+            difference += 1
+    return sizes
+
+
+def random_datetime(rng: random.Random, start: datetime, days: int) -> str:
+    moment = start + timedelta(seconds=rng.randrange(days * 86_400))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def generate(path: Path, config: GeneratorConfig) -> GeneratedCounts:
+    if config.tracks < config.albums:
+        raise ValueError("Need at least one track per album")
+    rng = random.Random(config.seed)
+    now = datetime(2026, 1, 1)
+    history_start = now - timedelta(days=3_650)
+    created = "2024-01-01 00:00:00"
+
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript(SCHEMA)
+
+    user_ids = [make_id(rng) for _ in range(config.users)]
+    conn.executemany(
+        "INSERT INTO user (id, user_name, name, is_admin, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (user_id, f"user{index}", f"User {index}", index == 0, created, created)
+            for index, user_id in enumerate(user_ids)
+        ],
+    )
+    conn.execute("INSERT INTO library (id, name, path) VALUES (1, 'Music', '/music')")
+
+    artists = [make_name(rng, rng.choice((1, 2, 2, 3)), article=True) for _ in range(config.artists)]
+    artist_weights = zipf_weights(config.artists, 0.8)
+    album_artists = rng.choices(range(config.artists), weights=artist_weights, k=config.albums)
+    sizes = album_sizes(rng, config.albums, config.tracks)
+
+    folders: list[tuple[object, ...]] = [(make_id(rng), 1, "", ".", False, "", 0, "[]", created, created)]
+    root_id = folders[0][0]
+    artist_folder_ids: dict[int, str] = {}
+    album_rows: list[tuple[object, ...]] = []
+    track_rows: list[tuple[object, ...]] = []
+    # (track_id, album popularity) for every track that may be annotated.
+    playable: list[tuple[str, float]] = []
+
+    for album_index, (artist_index, size) in enumerate(zip(album_artists, sizes)):
+        artist = artists[artist_index]
+        if artist_index not in artist_folder_ids:
+            artist_folder_ids[artist_index] = make_id(rng)
+            folders.append(
+                (artist_folder_ids[artist_index], 1, ".", artist, False, root_id, 0, "[]", created, created)
+            )
+        album_name = make_name(rng, rng.choice((1, 2, 3, 4)), article=rng.random() < 0.1)
+        album_id = make_id(rng)
+        folder_id = make_id(rng)
+        year = rng.randint(1955, 2025)
+        if rng.random() < config.bad_date_ratio:
+            date = rng.choice(("", None, f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "unknown"))
+        else:
+            date = str(year)
+        image_files = "[]" if rng.random() < config.missing_art_ratio else '["cover.jpg"]'
+        folders.append((folder_id, 1, artist, album_name, False, artist_folder_ids[artist_index], size, image_files, created, created))
+        # Pareto tails, capped so the busiest tracks stay in the low thousands of plays.
+        popularity = min(rng.paretovariate(1.2), 50.0)
+
+        duration_total = 0.0
+        discs = 2 if size > 18 and rng.random() < 0.3 else 1
+        for track_index in range(size):
+            title = make_name(rng, rng.choice((1, 2, 3, 4, 5))).lower().capitalize()
+            disc = 1 + track_index * discs // size
+            duration = rng.uniform(90, 480)
+            duration_total += duration
+            copies = 2 if rng.random() < config.duplicate_ratio else 1
+            for copy in range(copies):
+                track_id = make_id(rng)
+                suffix = "" if copy == 0 else " (1)"
+                track_path = f"{artist}/{album_name}/{disc}-{track_index + 1:02d} {title}{suffix}.mp3"
+                full_text = " " + " ".join(sorted({*f"{title} {album_name} {artist}".lower().split()}))
+                track_rows.append(
+                    (
+                        track_id,
+                        folder_id,
+                        track_path,
+                        title,
+                        album_name,
+                        artist,
+                        artist,
+                        album_id,
+                        track_index + 1,
+                        disc,
+                        year,
+                        duration + copy * rng.uniform(-1, 1),
+                        full_text,
+                        sort_name(title),
+                        sort_name(album_name),
+                        sort_name(artist),
+                        rng.random() < config.missing_ratio,
+                        created,
+                        created,
+                    )
+                )
+                playable.append((track_id, popularity))
+        album_rows.append(
+            (album_id, album_name, artist, date, year, year, size, duration_total, sort_name(album_name), sort_name(artist), created, created)
+        )
+
+    for _ in range(config.extra_folders):
+        parent_index = rng.choice(album_artists)
+        parent = artist_folder_ids[parent_index]
+        name = rng.choice(("Scans", "Artwork", "Extras", "Covers", "Booklet"))
+        image_files = rng.choice(("[]", '["front.jpg","back.jpg"]'))
+        folders.append((make_id(rng), 1, artists[parent_index], name, False, parent, 0, image_files, created, created))
+
+    conn.executemany(
+        """
+        INSERT INTO folder (id, library_id, path, name, missing, parent_id, num_audio_files, image_files, updated_at, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        folders,
+    )
+    conn.executemany(
+        """
+        INSERT INTO album (id, name, album_artist, date, min_year, max_year, song_count, duration,
+                           order_album_name, order_album_artist_name, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        album_rows,
+    )
+    conn.executemany(
+        """
+        INSERT INTO media_file (id, folder_id, path, title, album, artist, album_artist, album_id,
+                                track_number, disc_number, year, duration, full_text,
+                                order_title, order_album_name, order_artist_name, missing,
+                                created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        track_rows,
+    )
+
+    annotations: list[tuple[object, ...]] = []
+    ratings = list(RATING_WEIGHTS)
+    rating_weights = list(RATING_WEIGHTS.values())
+    for user_index, user_id in enumerate(user_ids):
+        # Later users listen less, so per-user annotation counts are skewed too.
+        ratio = config.annotated_ratio / (user_index + 1)
+        for track_id, popularity in playable:
+            if rng.random() >= min(1.0, ratio * math.sqrt(popularity)):
+                continue
+            play_count = int(popularity * min(rng.paretovariate(1.5), 40.0)) - 1
+            play_date = random_datetime(rng, history_start, 3_650) if play_count > 0 else None
+            rating = rng.choices(ratings, rating_weights)[0] if rng.random() < config.rated_ratio else 0
+            rated_at = random_datetime(rng, history_start, 3_650) if rating else None
+            annotations.append((user_id, track_id, "media_file", max(0, play_count), play_date, rating, rated_at))
+            if rng.random() < config.legacy_annotation_ratio:
+                annotations.append((user_id, track_id, "track", rng.randint(0, 5), play_date, rating, rated_at))
+    conn.executemany(
+        """
+        INSERT INTO annotation (user_id, item_id, item_type, play_count, play_date, rating, rated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        annotations,
+    )
+    conn.execute(
+        """
+        INSERT INTO annotation (user_id, item_id, item_type, play_count, play_date)
+        SELECT a.user_id, mf.album_id, 'album', SUM(a.play_count), MAX(a.play_date)
+        FROM annotation a
+        JOIN media_file mf ON mf.id = a.item_id
+        WHERE a.item_type = 'media_file'
+        GROUP BY a.user_id, mf.album_id
+        """
+    )
+    conn.execute(
+        """
+        UPDATE media_file
+        SET average_rating = rated.average
+        FROM (
+            SELECT item_id, AVG(rating) AS average
+            FROM annotation
+            WHERE item_type = 'media_file' AND rating > 0
+            GROUP BY item_id
+        ) AS rated
+        WHERE rated.item_id = media_file.id
+        """
+    )
+    conn.commit()
+    annotation_count = conn.execute("SELECT COUNT(*) FROM annotation").fetchone()[0]
+    conn.execute("ANALYZE")
+    conn.close()
+    return GeneratedCounts(
+        users=len(user_ids),
+        folders=len(folders),
+        albums=len(album_rows),
+        tracks=len(track_rows),
+        annotations=annotation_count,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path, help="Database file to create (overwritten)")
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--artists", type=int, default=defaults.artists)
+    parser.add_argument("--albums", type=int, default=defaults.albums)
+    parser.add_argument("--tracks", type=int, default=defaults.tracks, help="Tracks before duplicates are added")
+    parser.add_argument("--extra-folders", type=int, default=defaults.extra_folders, help="Folders without audio files")
+    parser.add_argument("--annotated-ratio", type=float, default=defaults.annotated_ratio, help="Share of tracks the first user has played or rated")
+    parser.add_argument("--rated-ratio", type=float, default=defaults.rated_ratio, help="Share of annotated tracks with a rating")
+    parser.add_argument("--legacy-annotation-ratio", type=float, default=defaults.legacy_annotation_ratio, help="Share of annotated tracks that also have an item_type='track' row")
+    parser.add_argument("--missing-art-ratio", type=float, default=defaults.missing_art_ratio)
+    parser.add_argument("--bad-date-ratio", type=float, default=defaults.bad_date_ratio, help="Share of albums whose date is not YYYY")
+    parser.add_argument("--missing-ratio", type=float, default=defaults.missing_ratio, help="Share of tracks flagged missing")
+    parser.add_argument("--duplicate-ratio", type=float, default=defaults.duplicate_ratio, help="Share of tracks stored twice")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    config = GeneratorConfig(
+        users=args.users,
+        artists=args.artists,
+        albums=args.albums,
+        tracks=args.tracks,
+        extra_folders=args.extra_folders,
+        annotated_ratio=args.annotated_ratio,
+        rated_ratio=args.rated_ratio,
+        legacy_annotation_ratio=args.legacy_annotation_ratio,
+        missing_art_ratio=args.missing_art_ratio,
+        bad_date_ratio=args.bad_date_ratio,
+        missing_ratio=args.missing_ratio,
+        duplicate_ratio=args.duplicate_ratio,
+        seed=args.seed,
+    )
+    started = time.perf_counter()
+    try:
+        counts = generate(args.output, config)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(
+        f"{args.output}: {counts.users} users, {counts.folders} folders, {counts.albums} albums, "
+        f"{counts.tracks} tracks, {counts.annotations} annotations "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())